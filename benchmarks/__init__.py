@@ -0,0 +1 @@
+"""오프라인 벤치마크 - 합성 리뷰 생성기(synthetic)와 실행기(run)"""
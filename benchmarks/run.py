@@ -0,0 +1,152 @@
+"""
+대시보드 핵심 함수 벤치마크 (BigQuery 없이 합성 데이터로 실행)
+
+사용법
+    python -m benchmarks.run --sizes 1000 10000 100000 1000000 --out bench.json
+    python -m benchmarks.run --sizes 1000 10000 --compare bench.json
+
+캐시 영향을 없애기 위해 데코레이터로 감싼 함수는 원본(inspect.unwrap)을 호출한다.
+합성 데이터는 앱과 같게 compact_review_frame 으로 변환한 뒤 측정한다.
+"""
+import json
+import inspect
+import time
+import argparse
+import platform
+import datetime as dt
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_predicted_reviews, NOUNS
+from review_frame import compact_review_frame
+from keyword_analyzer import extract_keywords_batch, calculate_keyword_sentiment_streaming
+from search_index import NgramIndex
+from keyword_matrix import KeywordMatrix
+from ui_components import search_reviews, create_keyword_comparison_section
+from chart_generator import create_bubble_chart, create_top_keywords_chart, \
+    create_sentiment_distribution_chart, create_correlation_matrix
+
+
+def _unwrap(func):
+    # 계측·캐시 데코레이터를 모두 벗긴 원본 함수
+    return inspect.unwrap(func)
+
+
+def _time(func, repeat: int) -> tuple[float, object]:
+    """repeat 번 실행 중 가장 짧은 시간과 마지막 결과"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run_benchmarks(sizes, *, repeat=3, top_n=50, seed=42, max_tokenize_rows=100_000) -> list[dict]:
+    results = []
+    keywords = [(noun, 0) for noun in NOUNS[:top_n]]
+
+    def record(name, rows, seconds, **extra):
+        results.append({"benchmark": name, "rows": rows, "seconds": seconds, **extra})
+        print(f"{name:<40} {rows:>10,} rows  {seconds * 1000:>10.1f} ms")
+
+    for n_rows in sizes:
+        # 앱이 처리하는 것과 같은 컬럼 타입 (category / int8 / Arrow 문자열)
+        df = compact_review_frame(generate_predicted_reviews(n_rows, seed=seed))
+
+        # 형태소 분석은 느리므로 max_tokenize_rows 이하에서만 측정 (1회)
+        if n_rows <= max_tokenize_rows:
+            seconds, keywords = _time(
+                lambda: _unwrap(extract_keywords_batch)(df["content"], top_n=top_n), 1
+            )
+            record("extract_keywords_batch", n_rows, seconds)
+
+        seconds, keyword_df = _time(
+            lambda: _unwrap(calculate_keyword_sentiment_streaming)(df, keywords), repeat
+        )
+        record("calculate_keyword_sentiment_streaming", n_rows, seconds, keywords=len(keywords))
+
+        seconds, _ = _time(lambda: search_reviews(df, "배송"), repeat)
+        record("search_reviews", n_rows, seconds)
+
+        seconds, index = _time(lambda: NgramIndex(df["content"]), 1)
+        record("NgramIndex", n_rows, seconds, index_bytes=index.nbytes)
+
+        seconds, _ = _time(lambda: search_reviews(df, "배송", index=index), repeat)
+        record("search_reviews[index]", n_rows, seconds)
+
+        seconds, matrix = _time(lambda: KeywordMatrix(df, keyword_df["keyword"].tolist()), 1)
+        record("KeywordMatrix", n_rows, seconds, keywords=len(matrix.keywords), nnz=int(matrix.matrix.nnz))
+
+        seconds, _ = _time(lambda: (matrix.keyword_stats(recent_since="2024-01-01"), matrix.pairs()), repeat)
+        record("KeywordMatrix.keyword_stats+pairs", n_rows, seconds, keywords=len(matrix.keywords))
+
+        # 키워드 비교 섹션 전체 (streamlit run 밖에서는 위젯이 기본값 = 상위 10개 키워드를 돌려준다)
+        seconds, _ = _time(lambda: create_keyword_comparison_section(keyword_df, matrix), 1)
+        record("create_keyword_comparison_section", n_rows, seconds, keywords=min(len(keyword_df), 10))
+
+        for builder in (create_bubble_chart, create_top_keywords_chart,
+                        create_sentiment_distribution_chart, create_correlation_matrix):
+            seconds, fig = _time(lambda: _unwrap(builder)(keyword_df).to_json(), repeat)
+            record(builder.__name__, n_rows, seconds, payload_bytes=len(fig))
+
+    return results
+
+
+def compare_results(current: list[dict], baseline: list[dict], threshold: float = 1.2) -> list[dict]:
+    """기준 결과 대비 threshold 배 이상 느려진 항목"""
+    base = {(r["benchmark"], r["rows"]): r["seconds"] for r in baseline}
+    regressions = []
+    for r in current:
+        before = base.get((r["benchmark"], r["rows"]))
+        if before and r["seconds"] > before * threshold:
+            regressions.append({**r, "baseline_seconds": before, "ratio": r["seconds"] / before})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top-n", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-tokenize-rows", type=int, default=100_000)
+    parser.add_argument("--out", default="bench_results.json")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=1.2)
+    args = parser.parse_args()
+
+    results = run_benchmarks(
+        args.sizes,
+        repeat=args.repeat,
+        top_n=args.top_n,
+        seed=args.seed,
+        max_tokenize_rows=args.max_tokenize_rows
+    )
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "created_at": dt.datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "seed": args.seed,
+                "repeat": args.repeat
+            },
+            "results": results
+        }, f, ensure_ascii=False, indent=2)
+    print(f"saved: {args.out}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare_results(results, baseline, args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['benchmark']} {r['rows']:,} rows: "
+                  f"{r['baseline_seconds'] * 1000:.1f} → {r['seconds'] * 1000:.1f} ms (x{r['ratio']:.2f})")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+predicted_reviews 형태의 합성 데이터 생성기 (시드 고정)
+실제 리뷰와 비슷한 명사 어휘·조사·서술어 조합으로 한국어 리뷰 본문을 만들고
+별점과 감성 라벨을 서로 연관되게 뽑는다.
+"""
+import numpy as np
+import pandas as pd
+
+
+NOUNS = [
+    "배송", "포장", "가격", "품질", "디자인", "색상", "사이즈", "재질", "냄새", "마감",
+    "택배", "박스", "파손", "교환", "환불", "문의", "답변", "상담", "구성", "용량",
+    "보습", "향기", "제형", "피부", "트러블", "발림", "흡수", "지속력", "성분", "자극",
+    "맛", "식감", "양", "유통기한", "신선도", "간식", "아이", "남편", "선물", "부모님",
+    "세탁", "보풀", "수납", "조립", "설명서", "부품", "소음", "배터리", "충전", "화면",
+    "가성비", "재구매", "할인", "쿠폰", "이벤트", "리뷰", "사진", "실물", "만족도", "추천",
+]
+JOSA = ["이", "가", "은", "는", "도", "", "까지", "만"]
+POSITIVE = ["좋아요", "만족합니다", "최고예요", "빨라요", "괜찮네요", "마음에 들어요", "튼튼해요"]
+NEGATIVE = ["별로예요", "아쉬워요", "느려요", "불량이에요", "실망했어요", "엉망이에요", "비싸요"]
+NEUTRAL = ["보통이에요", "그냥 그래요", "무난해요", "생각했던 정도예요"]
+PLATFORMS = ["coupang", "naver", "11st", "gmarket", "musinsa"]
+CATEGORIES = ["뷰티", "식품", "가전", "패션", "생활용품", "유아동"]
+
+# 별점별 감성 확률 (negative, neutral, positive)
+_SENTIMENT_BY_STAR = {
+    1: (0.85, 0.10, 0.05),
+    2: (0.70, 0.20, 0.10),
+    3: (0.30, 0.45, 0.25),
+    4: (0.08, 0.22, 0.70),
+    5: (0.03, 0.07, 0.90),
+}
+_LABELS = np.array(["negative", "neutral", "positive"])
+_PREDICATES = {"negative": NEGATIVE, "neutral": NEUTRAL, "positive": POSITIVE}
+
+
+def _review_text(rng: np.random.Generator, label: str, n_clauses: int) -> str:
+    clauses = []
+    for _ in range(n_clauses):
+        noun = NOUNS[rng.integers(len(NOUNS))]
+        josa = JOSA[rng.integers(len(JOSA))]
+        # 감성과 다른 서술어도 섞어 현실적인 노이즈를 준다
+        pool = _PREDICATES[label] if rng.random() < 0.8 else _PREDICATES[_LABELS[rng.integers(3)]]
+        clauses.append(f"{noun}{josa} {pool[rng.integers(len(pool))]}")
+    return ". ".join(clauses) + "."
+
+
+def generate_predicted_reviews(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """predicted_reviews 컬럼 구성을 따르는 합성 리뷰 DataFrame"""
+    rng = np.random.default_rng(seed)
+
+    stars = rng.choice([1, 2, 3, 4, 5], size=n_rows, p=[0.05, 0.05, 0.10, 0.25, 0.55])
+    uniforms = rng.random(n_rows)
+    probs = np.array([_SENTIMENT_BY_STAR[s] for s in range(1, 6)])[stars - 1].cumsum(axis=1)
+    true_label = _LABELS[(uniforms[:, None] > probs).sum(axis=1)]
+
+    # 예측 라벨은 90% 확률로 정답
+    wrong = rng.random(n_rows) >= 0.9
+    pred_label = true_label.copy()
+    pred_label[wrong] = _LABELS[rng.integers(3, size=wrong.sum())]
+
+    n_clauses = rng.integers(1, 6, size=n_rows)
+    content = [_review_text(rng, label, k) for label, k in zip(true_label, n_clauses)]
+
+    end = pd.Timestamp("2025-06-30", tz="UTC")
+    created_at = end - pd.to_timedelta(rng.integers(0, 365 * 24 * 3600, size=n_rows), unit="s")
+    product_ids = rng.integers(0, max(n_rows // 50, 1), size=n_rows)
+
+    df = pd.DataFrame({
+        "review_uid": [f"r{seed}-{i}" for i in range(n_rows)],
+        "review_id": np.arange(n_rows).astype(str),
+        "product_id": [f"p{p}" for p in product_ids],
+        "content": content,
+        "star": stars,
+        "true_label": true_label,
+        "pred_label": pred_label,
+        "is_correct": true_label == pred_label,
+        "category": np.array(CATEGORIES)[rng.integers(len(CATEGORIES), size=n_rows)],
+        "platform": np.array(PLATFORMS)[rng.integers(len(PLATFORMS), size=n_rows)],
+        "created_at": created_at,
+    })
+    df["run_date"] = df["created_at"].dt.date
+    return df.sort_values("created_at", ascending=False, ignore_index=True)
@@ -0,0 +1,97 @@
+"""
+형태소 분석기 백엔드 속도·품질 비교 (같은 리뷰로 Okt 대비 측정)
+
+사용법
+    python -m benchmarks.tokenizers --rows 5000
+    python -m benchmarks.tokenizers --input reviews.parquet --backends okt kiwi regex --top-n 100
+
+백엔드별 초기화 시간(Okt 는 JVM 기동 포함), 초기화 후 최대 RSS, 초당 명사/리뷰 수,
+그리고 상위 N개 명사가 기준 백엔드(기본 okt)의 상위 N개와 겹치는 비율을 출력한다.
+최대 RSS 는 프로세스 누적값이므로 메모리를 비교할 때는 --backends 로 하나씩 따로 실행한다.
+"""
+import json
+import time
+import argparse
+import resource
+from collections import Counter
+
+import pandas as pd
+
+from benchmarks.synthetic import generate_predicted_reviews
+from keyword_analyzer import _clean_text
+from noun_tokenizers import TOKENIZER_BACKENDS, available_tokenizers
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _load_texts(args) -> list[str]:
+    if args.input:
+        df = pd.read_parquet(args.input) if args.input.endswith(".parquet") else pd.read_csv(args.input)
+        df = df.dropna(subset=["content"]).head(args.rows)
+    else:
+        df = generate_predicted_reviews(args.rows, seed=args.seed)
+    return [_clean_text(str(text)) for text in df["content"]]
+
+
+def compare_tokenizers(texts: list[str], backends: list[str], *, reference="okt", top_n=50, min_length=2) -> list[dict]:
+    results, top_sets = [], {}
+
+    for name in backends:
+        started = time.perf_counter()
+        tokenizer = TOKENIZER_BACKENDS[name][0]()
+        tokenizer.nouns("워밍업")
+        init_seconds = time.perf_counter() - started
+        rss_after_init = _peak_rss_mb()
+
+        started = time.perf_counter()
+        tokens = [tokenizer.nouns(text) for text in texts]
+        seconds = time.perf_counter() - started
+
+        n_nouns = sum(map(len, tokens))
+        counter = Counter(n for nouns in tokens for n in nouns if len(n) >= min_length)
+        top_sets[name] = {noun for noun, _ in counter.most_common(top_n)}
+        results.append({
+            "tokenizer": name,
+            "reviews": len(texts),
+            "init_seconds": init_seconds,
+            "peak_rss_mb_after_init": rss_after_init,
+            "seconds": seconds,
+            "reviews_per_sec": len(texts) / seconds if seconds else 0.0,
+            "nouns_per_sec": n_nouns / seconds if seconds else 0.0,
+            "vocabulary": len(counter)
+        })
+
+    ref = reference if reference in top_sets else backends[0]
+    for r in results:
+        overlap = top_sets[r["tokenizer"]] & top_sets[ref]
+        r["reference"] = ref
+        r[f"top{top_n}_overlap"] = len(overlap) / max(len(top_sets[ref]), 1)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--input", help="content 컬럼이 있는 parquet/csv (생략 시 합성 데이터)")
+    parser.add_argument("--backends", nargs="+", default=None, help="생략 시 설치된 백엔드 전체")
+    parser.add_argument("--reference", default="okt")
+    parser.add_argument("--top-n", type=int, default=50)
+    parser.add_argument("--out", help="결과 JSON 경로")
+    args = parser.parse_args()
+
+    backends = args.backends or available_tokenizers()
+    texts = _load_texts(args)
+    results = compare_tokenizers(texts, backends, reference=args.reference, top_n=args.top_n)
+
+    print(pd.DataFrame(results).to_string(index=False))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"saved: {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+데이터셋 지문(fingerprint) 기반 캐시 키
+로더·필터가 DataFrame 에 가벼운 지문(원본 쿼리, 워터마크, 필터 선택)을 붙이고,
+fingerprint_cache 로 감싼 분석 함수는 Series/DataFrame 내용을 해시하는 대신
+그 지문을 캐시 키로 쓴다. 함수별 히트/미스와 키 계산 시간을 기록한다.
+"""
+import time
+import hashlib
+import threading
+import functools
+import pandas as pd
+import streamlit as st
+
+
+_stats_lock = threading.Lock()
+_cache_stats: dict[str, dict] = {}
+_miss_flag = threading.local()
+
+
+def make_fingerprint(*parts) -> str:
+    """임의의 값들로 짧은 결정적 지문 생성"""
+    return hashlib.sha1("|".join(map(str, parts)).encode("utf-8")).hexdigest()[:16]
+
+
+def tag_frame(df, fingerprint: str):
+    """DataFrame/Series 에 지문을 붙인다 (attrs 를 새 dict 로 바꿔 원본과 공유하지 않음)"""
+    df.attrs = {**df.attrs, "fingerprint": fingerprint}
+    return df
+
+
+def frame_fingerprint(obj) -> str:
+    """
+    Series/DataFrame 의 지문.
+
+    attrs 에 지문이 있으면 컬럼 이름·인덱스 값의 해시와 묶어서 사용하고
+    (필터·슬라이스로 지문이 전파된 파생 프레임과 구분), 없으면 내용을 해시한다.
+    인덱스 해시는 값 전체가 아니라 인덱스 한 열만 보므로 내용 해시보다 훨씬 싸다.
+    """
+    fingerprint = obj.attrs.get("fingerprint")
+    if fingerprint:
+        shape_name = obj.name if isinstance(obj, pd.Series) else tuple(obj.columns)
+        index_hash = pd.util.hash_pandas_object(obj.index, index=False).to_numpy()
+        return make_fingerprint(
+            fingerprint, len(obj), shape_name, hashlib.sha1(index_hash.tobytes()).hexdigest()
+        )
+
+    hashed = pd.util.hash_pandas_object(obj, index=True).to_numpy()
+    return hashlib.sha1(hashed.tobytes()).hexdigest()[:16]
+
+
+def _record(name: str, hit: bool, hash_seconds: float, call_seconds: float):
+    with _stats_lock:
+        s = _cache_stats.setdefault(
+            name, {"function": name, "hits": 0, "misses": 0, "hash_seconds": 0.0, "call_seconds": 0.0}
+        )
+        s["hits" if hit else "misses"] += 1
+        s["hash_seconds"] += hash_seconds
+        s["call_seconds"] += call_seconds
+
+
+def get_cache_stats() -> pd.DataFrame:
+    """함수별 히트/미스 횟수와 누적 키 계산·호출 시간"""
+    with _stats_lock:
+        return pd.DataFrame(list(_cache_stats.values()))
+
+
+def fingerprint_cache(shared: bool = False, **cache_kwargs):
+    """
+    st.cache_data 대체 데코레이터.
+
+    Series/DataFrame 인자는 frame_fingerprint 로 바꿔 캐시 키에 넣고
+    실제 데이터는 해시하지 않는 인자로 넘긴다. 나머지 인자는 st.cache_data 가 평소처럼 해시한다.
+    shared=True 이면 프로세스 내 캐시 미스 때 공유 캐시(shared_cache)를 거친다.
+    """
+    def decorator(func):
+        name = func.__qualname__
+
+        def cached(key, args, kwargs, _data):
+            _miss_flag.value = True
+            # 데이터 자리가 None 인 상태의 repr 이 그대로 공유 캐시 키가 된다
+            shared_key = make_fingerprint(key, repr(args), repr(sorted(kwargs.items()))) if shared else None
+            args = [_data.get(i, a) for i, a in enumerate(args)]
+            kwargs = {k: _data.get(k, v) for k, v in kwargs.items()}
+            if not shared:
+                return func(*args, **kwargs)
+
+            from shared_cache import cached_call, function_cache_name  # shared_cache 가 이 모듈을 import
+
+            return cached_call(function_cache_name(func), shared_key, lambda: func(*args, **kwargs))
+
+        # st.cache_data 는 함수 모듈·이름으로 캐시를 구분하므로 원래 함수 이름을 붙인다
+        cached.__module__ = func.__module__
+        cached.__qualname__ = f"{name}.<fingerprint_cache>"
+        cached = st.cache_data(**cache_kwargs)(cached)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            data, key = {}, []
+            args = list(args)
+            for i, a in enumerate(args):
+                if isinstance(a, (pd.Series, pd.DataFrame)):
+                    data[i], args[i] = a, None
+                    key.append((i, frame_fingerprint(a)))
+            for k, v in list(kwargs.items()):
+                if isinstance(v, (pd.Series, pd.DataFrame)):
+                    data[k], kwargs[k] = v, None
+                    key.append((k, frame_fingerprint(v)))
+            hashed = time.perf_counter()
+
+            _miss_flag.value = False
+            result = cached(name + ":" + repr(key), args, kwargs, _data=data)
+            _record(name, not _miss_flag.value, hashed - started, time.perf_counter() - hashed)
+            return result
+
+        return wrapper
+
+    return decorator
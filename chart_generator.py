@@ -1,10 +1,50 @@
+"""
+키워드 분석 차트
+입력 DataFrame 지문(fingerprint_cache)으로 figure 를 재사용하고, 히스토그램·상관계수는 NumPy 로
+미리 계산해 집계 결과만 보낸다. 점이 많으면 WebGL(scattergl)로 그리고 표본을 줄인다.
+각 차트의 직렬화 크기는 캐시 미스일 때만 단계별 성능 패널(payload_bytes)에 기록된다.
+"""
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
 
+from cache_keys import fingerprint_cache
+from instrumentation import instrument, measure_payload
 
+
+# 이 개수를 넘으면 SVG 대신 WebGL 로 그린다
+WEBGL_THRESHOLD = 1_000
+# 산점도에 보낼 최대 점 개수 (리뷰 수가 많은 키워드 우선)
+MAX_SCATTER_POINTS = 5_000
+
+CORR_COLUMNS = ['frequency', 'positive_rate', 'avg_rating', 'review_count']
+
+
+def _downsample(df, max_points, by):
+    """by 가 큰 행 우선으로 max_points 개만 남긴다 (원래 순서 유지)"""
+    if len(df) <= max_points:
+        return df
+    keep = np.sort(np.argsort(-df[by].to_numpy(), kind="stable")[:max_points])
+    return df.iloc[keep]
+
+
+@instrument()
+@fingerprint_cache(show_spinner=False)
+@measure_payload
 def create_bubble_chart(keyword_df):
     """키워드별 빈도 + 긍정률 버블 차트"""
+    n_points = len(keyword_df)
+    # 차트에 쓰는 컬럼만, 표시 자릿수로 반올림해서 보낸다
+    plot_df = _downsample(keyword_df, MAX_SCATTER_POINTS, 'review_count')[
+        ['keyword', 'frequency', 'positive_rate', 'review_count', 'avg_rating']
+    ].round({'positive_rate': 1, 'avg_rating': 2})
+
+    title = "키워드별 빈도 vs 긍정률 (버블 크기: 리뷰 수, 색상: 평균 별점)"
+    if len(plot_df) < n_points:
+        title += f" - 리뷰 수 상위 {len(plot_df):,}/{n_points:,}개"
+
     fig = px.scatter(
-        keyword_df,
+        plot_df,
         x='frequency',
         y='positive_rate',
         size='review_count',
@@ -16,13 +56,14 @@ def create_bubble_chart(keyword_df):
             'review_count': True,
             'avg_rating': ':.2f'
         },
-        title="키워드별 빈도 vs 긍정률 (버블 크기: 리뷰 수, 색상: 평균 별점)",
+        title=title,
         labels={
             'frequency': '키워드 빈도',
             'positive_rate': '긍정률 (%)',
             'avg_rating': '평균 별점'
         },
-        color_continuous_scale='RdYlGn'
+        color_continuous_scale='RdYlGn',
+        render_mode='webgl' if len(plot_df) > WEBGL_THRESHOLD else 'auto'
     )
 
     fig.update_layout(
@@ -34,9 +75,12 @@ def create_bubble_chart(keyword_df):
     return fig
 
 
+@instrument()
+@fingerprint_cache(show_spinner=False)
+@measure_payload
 def create_top_keywords_chart(keyword_df, top_n=20):
     """상위 키워드 빈도 차트"""
-    top_keywords = keyword_df.head(top_n)
+    top_keywords = keyword_df.head(top_n)[['keyword', 'frequency', 'positive_rate']].round({'positive_rate': 1})
 
     fig = px.bar(
         top_keywords,
@@ -61,40 +105,154 @@ def create_top_keywords_chart(keyword_df, top_n=20):
     return fig
 
 
-def create_sentiment_distribution_chart(keyword_df):
-    """긍정률 분포 히스토그램"""
-    fig = px.histogram(
-        keyword_df,
-        x='positive_rate',
-        nbins=20,
+@instrument()
+@fingerprint_cache(show_spinner=False)
+@measure_payload
+def create_sentiment_distribution_chart(keyword_df, nbins=20):
+    """긍정률 분포 히스토그램 (구간별 개수만 전송)"""
+    rates = keyword_df['positive_rate'].to_numpy(dtype=float)
+    rates = rates[~np.isnan(rates)]
+    counts, edges = np.histogram(rates, bins=nbins, range=(0, 100))
+    mean_rate = rates.mean() if len(rates) else 0.0
+
+    fig = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        customdata=np.stack([edges[:-1], edges[1:]], axis=1),
+        hovertemplate="긍정률 %{customdata[0]:.0f}–%{customdata[1]:.0f}%<br>키워드 수 %{y}<extra></extra>"
+    ))
+    fig.update_layout(
         title="키워드별 긍정률 분포",
-        labels={
-            'positive_rate': '긍정률 (%)',
-            'count': '키워드 수'
-        }
+        xaxis_title="긍정률 (%)",
+        yaxis_title="키워드 수",
+        bargap=0
     )
 
     fig.add_vline(
-        x=keyword_df['positive_rate'].mean(),
+        x=mean_rate,
         line_dash="dash",
         line_color="red",
-        annotation_text=f"평균: {keyword_df['positive_rate'].mean():.1f}%"
+        annotation_text=f"평균: {mean_rate:.1f}%"
     )
 
     return fig
 
 
+@instrument()
+@fingerprint_cache(show_spinner=False)
+@measure_payload
 def create_correlation_matrix(keyword_df):
     """상관관계 매트릭스"""
-    corr_cols = ['frequency', 'positive_rate', 'avg_rating', 'review_count']
-    corr_matrix = keyword_df[corr_cols].corr()
+    values = keyword_df[CORR_COLUMNS].to_numpy(dtype=float)
+    values = values[~np.isnan(values).any(axis=1)]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = np.round(np.corrcoef(values, rowvar=False), 2) if len(values) > 1 \
+            else np.full((len(CORR_COLUMNS), len(CORR_COLUMNS)), np.nan)
 
-    fig = px.imshow(
-        corr_matrix,
-        text_auto=True,
-        aspect="auto",
+    fig = go.Figure(go.Heatmap(
+        z=corr,
+        x=CORR_COLUMNS,
+        y=CORR_COLUMNS,
+        text=corr,
+        texttemplate="%{text}",
+        colorscale='RdBu',
+        zmin=-1,
+        zmax=1
+    ))
+    fig.update_layout(
         title="키워드 지표 간 상관관계",
-        color_continuous_scale='RdBu'
+        yaxis={'autorange': 'reversed'}
+    )
+
+    return fig
+
+
+@instrument()
+@fingerprint_cache(show_spinner=False)
+@measure_payload
+def create_star_distribution_chart(summary_df):
+    """감성별 별점 분포 (상품 리뷰 집계 결과 기반)"""
+    fig = px.bar(
+        summary_df,
+        x='star',
+        y='review_count',
+        color='pred_label',
+        barmode='stack',
+        title="별점별 리뷰 수 (감성별)",
+        labels={
+            'star': '별점',
+            'review_count': '리뷰 수',
+            'pred_label': '감성'
+        },
+        color_discrete_map={
+            'positive': '#2ecc71',
+            'negative': '#e74c3c',
+            'neutral': '#f1c40f'
+        }
+    )
+
+    fig.update_layout(xaxis={'dtick': 1})
+
+    return fig
+
+
+@instrument()
+@fingerprint_cache(show_spinner=False)
+@measure_payload
+def create_keyword_trend_chart(daily_df, metric='review_count'):
+    """키워드별 일자 추이 라인 차트 (KeywordTrendCounters.daily 결과 기반)"""
+    fig = px.line(
+        daily_df,
+        x='day',
+        y=metric,
+        color='keyword',
+        render_mode='webgl' if len(daily_df) > WEBGL_THRESHOLD else 'auto',
+        title="키워드 추이",
+        labels={
+            'day': '날짜',
+            'review_count': '리뷰 수',
+            'positive_rate': '긍정률 (%)',
+            'keyword': '키워드'
+        }
     )
 
-    return fig
\ No newline at end of file
+    fig.update_layout(hovermode='x unified')
+
+    return fig
+
+
+COOCCURRENCE_METRICS = {
+    'review_count': ('동시 출현 리뷰 수', 'Blues', None),
+    'lift': ('lift', 'RdBu', 1.0),
+    'positive_rate': ('함께 등장한 리뷰의 긍정률 (%)', 'RdYlGn', 50.0)
+}
+
+
+@instrument()
+@fingerprint_cache(show_spinner=False)
+@measure_payload
+def create_cooccurrence_heatmap(matrix_df, metric='review_count'):
+    """키워드 × 키워드 동시 출현 히트맵 (KeywordMatrix 결과 기반)"""
+    title, colorscale, midpoint = COOCCURRENCE_METRICS[metric]
+    values = matrix_df.to_numpy(dtype=float)
+    if metric != 'positive_rate':
+        # 대각선(키워드 자기 자신)은 다른 칸과 척도가 달라 색을 지운다
+        np.fill_diagonal(values, np.nan)
+    values = np.round(values, 2)
+
+    fig = go.Figure(go.Heatmap(
+        z=values,
+        x=list(matrix_df.columns),
+        y=list(matrix_df.index),
+        colorscale=colorscale,
+        zmid=midpoint,
+        hovertemplate="%{y} + %{x}<br>" + title + ": %{z}<extra></extra>"
+    ))
+    fig.update_layout(
+        title=f"키워드 동시 출현 - {title}",
+        yaxis={'autorange': 'reversed'},
+        height=max(400, 22 * len(matrix_df) + 150)
+    )
+
+    return fig
@@ -1,19 +1,68 @@
+import os
 import streamlit as st
-from google.cloud import bigquery
-from google.oauth2 import service_account
+from concurrent.futures import Future, ThreadPoolExecutor
 
+from data_backend import BigQueryBackend, DuckDBBackend, QueryLedger
+from noun_tokenizers import resolve_tokenizer
+from shared_cache import open_shared_cache
 
-credential = st.secrets['GOOGLE_APPLICATION_CREDENTIALS']
-project_id = st.secrets['GCP_PROJECT_ID']
-layer = st.secrets['LAYER']
-product_table = st.secrets['PRODUCT_TABLE']
-review_table = st.secrets['REVIEW_TABLE']
-predicted_review_table = st.secrets['PREDICTED_REVIEW_TABLE']
+
+# 데이터 백엔드 선택 ("bigquery" | "duckdb")
+data_backend = st.secrets.get('DATA_BACKEND', 'bigquery')
+local_data_dir = st.secrets.get('LOCAL_DATA_DIR', 'data')
+
+# 결과 다운로드 방식 ("arrow" | "rest"), pyarrow 기반 pandas dtype 사용 여부
+fetch_mode = st.secrets.get('FETCH_MODE', 'arrow')
+arrow_dtypes = bool(st.secrets.get('ARROW_DTYPES', False))
+
+# 쿼리 비용 예산 (bytes, 0 이면 제한 없음)
+max_bytes_per_query = int(st.secrets.get('MAX_BYTES_PER_QUERY', 10 * 1024 ** 3))
+max_bytes_per_session = int(st.secrets.get('MAX_BYTES_PER_SESSION', 100 * 1024 ** 3))
+# 전체 테이블을 읽는 배치 작업(keyword_cube.py, data_backend.py 복제본)의 쿼리당 예산
+batch_max_bytes_per_query = int(st.secrets.get('BATCH_MAX_BYTES_PER_QUERY', 0))
+
+# BigQuery 설정 (duckdb 백엔드에서는 없어도 됨)
+credential = st.secrets.get('GOOGLE_APPLICATION_CREDENTIALS')
+project_id = st.secrets.get('GCP_PROJECT_ID')
+layer = st.secrets.get('LAYER')
+product_table = st.secrets.get('PRODUCT_TABLE')
+review_table = st.secrets.get('REVIEW_TABLE')
+predicted_review_table = st.secrets.get('PREDICTED_REVIEW_TABLE')
+keyword_cube_table = st.secrets.get('KEYWORD_CUBE_TABLE', 'keyword_cube')
+
+# predicted_reviews 증분 로딩 - 갱신 주기(초), 보관 기간(일, 0 이면 무제한)
+predicted_review_refresh_seconds = int(st.secrets.get('PREDICTED_REVIEW_REFRESH_SECONDS', 600))
+predicted_review_window_days = int(st.secrets.get('PREDICTED_REVIEW_WINDOW_DAYS', 0)) or None
+
+# 형태소 분석 풀 설정 ("thread" | "process")
+tokenizer_pool = st.secrets.get('TOKENIZER_POOL', 'thread')
+tokenizer_workers = int(st.secrets.get('TOKENIZER_WORKERS', os.cpu_count() or 1))
+
+# 형태소 분석기 백엔드 ("okt" | "kiwi" | "mecab" | "regex" | "auto" - 설치된 것 중 가장 빠른 것)
+tokenizer_backend = resolve_tokenizer(st.secrets.get('TOKENIZER_BACKEND', 'okt'))
+
+# review_uid 별 명사 토큰 저장소 경로 (빈 값이면 사용 안 함)
+token_store_path = st.secrets.get('TOKEN_STORE_PATH', '.cache/review_tokens.sqlite')
+
+# 키워드 추출을 고정 메모리 스케치로 할 때 유지할 후보 수 (0 이면 정확한 Counter)
+keyword_sketch_capacity = int(st.secrets.get('KEYWORD_SKETCH_CAPACITY', 0)) or None
+
+# 사이드바 조회 기간 기본값 (0 이면 전체 기간, 최근 N일로 좁히려면 7 | 30 | 90 | 365)
+default_date_range_days = int(st.secrets.get('DEFAULT_DATE_RANGE_DAYS', 0))
+
+# 프로세스·레플리카 공유 결과 캐시 ('sqlite:///경로' | 'redis://호스트:포트/DB', 빈 값이면 사용 안 함)
+shared_cache_url = st.secrets.get('SHARED_CACHE_URL', '')
+shared_cache_max_bytes = int(st.secrets.get('SHARED_CACHE_MAX_BYTES', 2 * 1024 ** 3))
+shared_cache_ttl = int(st.secrets.get('SHARED_CACHE_TTL', 3600)) or None
 
 
 @st.cache_resource
 def get_bigquery_client():
     """BigQuery 클라이언트 초기화 with secrets.toml"""
+    # google-cloud 패키지는 import 가 무거우므로 BigQuery 백엔드를 쓸 때만 로드
+    from google.cloud import bigquery
+    from google.oauth2 import service_account
+
     try:
         # secrets.toml에서 GCP credentials 가져오기
         credentials_dict = dict(st.secrets["GOOGLE_APPLICATION_CREDENTIALS"])
@@ -29,9 +78,7 @@ def get_bigquery_client():
             project=credentials_dict["project_id"]
         )
 
-        # 연결 테스트
-        client.query("SELECT 1").result()
-        st.success("✅ BigQuery 연결 성공!")
+        # 연결 테스트는 렌더링을 막지 않도록 get_backend_health 에서 백그라운드로 수행
         return client
 
     except FileNotFoundError:
@@ -68,3 +115,72 @@ def get_bigquery_client():
         4. project_id가 정확한지 확인
         """)
         return None
+
+
+def get_session_ledger():
+    """현재 Streamlit 세션의 쿼리 비용 원장"""
+    if 'query_ledger' not in st.session_state:
+        st.session_state['query_ledger'] = QueryLedger(session_budget=max_bytes_per_session or None)
+    return st.session_state['query_ledger']
+
+
+def get_bigquery_backend():
+    """BigQuery 클라이언트를 논리 테이블 이름으로 감싼 백엔드"""
+    client = get_bigquery_client()
+    if client is None:
+        return None
+
+    return BigQueryBackend(
+        client,
+        project_id=project_id,
+        dataset=layer,
+        tables={
+            "product": product_table,
+            "review": review_table,
+            "predicted_review": predicted_review_table,
+            "dim_category": "dim_category",
+            "dim_platform": "dim_platform",
+            "keyword_cube": keyword_cube_table
+        },
+        fetch_mode=fetch_mode,
+        arrow_dtypes=arrow_dtypes,
+        max_bytes_per_query=max_bytes_per_query or None,
+        ledger_provider=get_session_ledger
+    )
+
+
+@st.cache_resource
+def get_data_backend():
+    """DATA_BACKEND 설정에 따른 데이터 백엔드"""
+    if data_backend == "duckdb":
+        try:
+            return DuckDBBackend(
+                local_data_dir,
+                fetch_mode=fetch_mode,
+                arrow_dtypes=arrow_dtypes,
+                ledger_provider=get_session_ledger
+            )
+        except Exception as e:
+            st.error(f"❌ 로컬 DuckDB 백엔드 초기화 실패: {str(e)}")
+            return None
+
+    return get_bigquery_backend()
+
+
+@st.cache_resource
+def get_backend_health(_backend) -> Future:
+    """백엔드 연결 확인을 백그라운드 스레드에서 한 번 실행하고 Future 반환"""
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="health-check")
+    future = executor.submit(_backend.health_check)
+    executor.shutdown(wait=False)
+    return future
+
+
+@st.cache_resource
+def get_shared_cache():
+    """SHARED_CACHE_URL 설정에 따른 공유 캐시와 기본 TTL (연결 실패 시 사용 안 함)"""
+    try:
+        return open_shared_cache(shared_cache_url, shared_cache_max_bytes), shared_cache_ttl
+    except Exception as e:
+        st.warning(f"⚠️ 공유 캐시 연결 실패, 프로세스 내 캐시만 사용합니다: {str(e)}")
+        return None, None
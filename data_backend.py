@@ -0,0 +1,396 @@
+"""
+데이터 소스 백엔드
+1) BigQueryBackend ─ 운영 BigQuery 테이블
+2) DuckDBBackend   ─ 같은 테이블을 Parquet 파일로 복제한 로컬 DuckDB 엔진
+3) QueryLedger     ─ 쿼리별 예상/청구 바이트 기록 및 세션 예산
+
+data_processor 의 로더들은 백엔드가 돌려주는 테이블 참조(table)와
+query 만 사용하므로 두 백엔드에서 같은 SQL 을 그대로 실행한다.
+SQL 의 값은 문자열로 이어 붙이지 않고 `@name` 파라미터로 넘긴다
+(리스트는 `col IN UNNEST(@name)`).
+
+fetch_mode="arrow" 이면 결과를 Arrow 레코드 배치로 받아 타입(타임스탬프 등)을
+유지한 채 DataFrame 으로 변환하고, arrow_dtypes=True 이면 pyarrow 기반
+pandas dtype(문자열 등)을 그대로 사용해 object 컬럼의 메모리를 줄인다.
+"""
+import os
+import re
+import copy
+import threading
+import datetime as dt
+import pandas as pd
+import pyarrow as pa
+
+
+# 로더들이 사용하는 논리 테이블 이름
+TABLES = ("product", "review", "predicted_review", "dim_category", "dim_platform")
+# 배치 작업이 만들어 쓰는 파생 테이블
+DERIVED_TABLES = ("keyword_cube",)
+
+
+class QueryBudgetExceeded(Exception):
+    """쿼리 또는 세션의 바이트 예산 초과"""
+
+
+class QueryLedger:
+    """쿼리 실행 기록 - 라벨(호출한 로더)별 예상 바이트와 청구 바이트"""
+
+    def __init__(self, session_budget: int | None = None):
+        self.session_budget = session_budget
+        self.entries: list[dict] = []
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes_billed(self) -> int:
+        with self._lock:
+            return sum(e["bytes_billed"] for e in self.entries)
+
+    def check(self, label: str, estimated_bytes: int):
+        """이번 쿼리를 실행하면 세션 예산을 넘는지 확인"""
+        if not self.session_budget:
+            return
+        if self.total_bytes_billed + estimated_bytes > self.session_budget:
+            raise QueryBudgetExceeded(
+                f"{label}: 세션 예산 초과 (사용 {self.total_bytes_billed:,} + "
+                f"예상 {estimated_bytes:,} > {self.session_budget:,} bytes)"
+            )
+
+    def record(self, **entry):
+        with self._lock:
+            self.entries.append(entry)
+
+    def to_frame(self) -> pd.DataFrame:
+        with self._lock:
+            return pd.DataFrame(self.entries)
+
+
+class DataBackend:
+    """로더가 사용하는 최소 인터페이스"""
+
+    name = "base"
+
+    def __init__(
+        self,
+        fetch_mode: str = "arrow",
+        arrow_dtypes: bool = False,
+        max_bytes_per_query: int | None = None,
+        ledger_provider=None
+    ):
+        self.fetch_mode = fetch_mode
+        self.arrow_dtypes = arrow_dtypes
+        self.max_bytes_per_query = max_bytes_per_query
+        # 세션별 원장을 돌려주는 함수 (없으면 백엔드 공용 원장 사용)
+        self.ledger_provider = ledger_provider
+        self._default_ledger = QueryLedger()
+
+    @property
+    def identity(self) -> str:
+        """캐시 키용 데이터 출처 식별자 - 같은 이름의 백엔드라도 테이블이 다르면 달라야 한다"""
+        return self.name
+
+    def with_budget(self, max_bytes_per_query: int | None) -> "DataBackend":
+        """
+        쿼리당 예산만 바꾼 사본 (0/None 이면 제한 없음).
+
+        전체 테이블을 읽는 배치 작업용 - 대시보드 세션 원장 대신 작업 전용 원장에 기록한다.
+        """
+        backend = copy.copy(self)
+        backend.max_bytes_per_query = max_bytes_per_query or None
+        backend.ledger_provider = None
+        backend._default_ledger = QueryLedger()
+        return backend
+
+    @property
+    def ledger(self) -> QueryLedger:
+        if self.ledger_provider is not None:
+            return self.ledger_provider()
+        return self._default_ledger
+
+    def table(self, logical_name: str) -> str:
+        """SQL 에 바로 넣을 수 있는 테이블 참조"""
+        raise NotImplementedError
+
+    def estimate_bytes(self, sql: str, params: dict | None = None) -> int:
+        """쿼리가 스캔할 예상 바이트 (드라이런)"""
+        return 0
+
+    def health_check(self):
+        """연결 확인용 최소 쿼리 (실패 시 예외)"""
+        raise NotImplementedError
+
+    def write_table(self, logical_name: str, df: pd.DataFrame):
+        """DataFrame 으로 논리 테이블을 통째로 교체 (배치 작업용)"""
+        raise NotImplementedError
+
+    def query_batches(self, sql: str, params: dict | None = None, label: str = "query"):
+        """SQL 실행 결과를 Arrow RecordBatch 단위로 스트리밍"""
+        raise NotImplementedError
+
+    def query_arrow(self, sql: str, params: dict | None = None, label: str = "query") -> pa.Table:
+        """SQL 실행 결과를 Arrow Table 로 반환 (결과가 비어도 컬럼을 유지해야 한다)"""
+        raise NotImplementedError
+
+    def query(self, sql: str, params: dict | None = None, label: str = "query") -> pd.DataFrame:
+        """SQL 실행 결과를 DataFrame 으로 반환"""
+        return self.to_pandas(self.query_arrow(sql, params, label))
+
+    def to_pandas(self, table: pa.Table) -> pd.DataFrame:
+        """Arrow Table → DataFrame (arrow_dtypes 이면 pyarrow 기반 dtype 유지)"""
+        if self.arrow_dtypes:
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+        return table.to_pandas()
+
+
+def _bigquery_type(value) -> str:
+    # bool 은 int 의 하위 타입이므로 먼저 검사
+    if isinstance(value, bool):
+        return "BOOL"
+    if isinstance(value, int):
+        return "INT64"
+    if isinstance(value, float):
+        return "FLOAT64"
+    if isinstance(value, dt.datetime):
+        return "TIMESTAMP"
+    if isinstance(value, dt.date):
+        return "DATE"
+    return "STRING"
+
+
+def _bigquery_parameters(params: dict | None) -> list:
+    from google.cloud import bigquery
+
+    parameters = []
+    for name, value in (params or {}).items():
+        if isinstance(value, (list, tuple)):
+            values = list(value)
+            parameters.append(bigquery.ArrayQueryParameter(
+                name, _bigquery_type(values[0]) if values else "STRING", values
+            ))
+        else:
+            parameters.append(bigquery.ScalarQueryParameter(name, _bigquery_type(value), value))
+    return parameters
+
+
+class BigQueryBackend(DataBackend):
+    """
+    BigQuery 백엔드.
+
+    fetch_mode="rest"  : 기존 to_dataframe() (REST tabledata.list) 경로
+    fetch_mode="arrow" : BigQuery Storage Read API 로 여러 스트림을 병렬로 읽어
+                         Arrow 레코드 배치로 받는다
+
+    모든 쿼리는 먼저 드라이런으로 스캔 바이트를 추정해 쿼리/세션 예산을 확인하고,
+    실제 실행에는 maximum_bytes_billed 를 걸어 예산을 넘는 작업을 BigQuery 가 거부하게 한다.
+    """
+
+    name = "bigquery"
+
+    def __init__(self, client, project_id: str, dataset: str, tables: dict[str, str], **kwargs):
+        super().__init__(**kwargs)
+        self.client = client
+        self.project_id = project_id
+        self.dataset = dataset
+        self.tables = tables
+        self._bqstorage_client = None
+
+    @property
+    def identity(self) -> str:
+        tables = ",".join(f"{k}={v}" for k, v in sorted(self.tables.items()))
+        return f"{self.name}:{self.project_id}.{self.dataset}:{tables}"
+
+    def table(self, logical_name: str) -> str:
+        return f"`{self.project_id}.{self.dataset}.{self.tables[logical_name]}`"
+
+    def _get_bqstorage_client(self):
+        if self._bqstorage_client is None:
+            from google.cloud import bigquery_storage
+
+            self._bqstorage_client = bigquery_storage.BigQueryReadClient(
+                credentials=self.client._credentials
+            )
+        return self._bqstorage_client
+
+    def health_check(self):
+        self.client.query("SELECT 1").result()
+
+    def write_table(self, logical_name: str, df: pd.DataFrame):
+        from google.cloud import bigquery
+
+        self.client.load_table_from_dataframe(
+            df,
+            f"{self.project_id}.{self.dataset}.{self.tables[logical_name]}",
+            job_config=bigquery.LoadJobConfig(write_disposition="WRITE_TRUNCATE")
+        ).result()
+
+    def estimate_bytes(self, sql: str, params: dict | None = None) -> int:
+        from google.cloud import bigquery
+
+        job = self.client.query(sql, job_config=bigquery.QueryJobConfig(
+            dry_run=True,
+            use_query_cache=False,
+            query_parameters=_bigquery_parameters(params)
+        ))
+        return job.total_bytes_processed or 0
+
+    def _run(self, sql: str, params: dict | None, label: str):
+        """예산 확인 → 실행 → 원장 기록 후 RowIterator 반환"""
+        from google.cloud import bigquery
+
+        estimated = self.estimate_bytes(sql, params)
+        if self.max_bytes_per_query and estimated > self.max_bytes_per_query:
+            raise QueryBudgetExceeded(
+                f"{label}: 쿼리 예산 초과 (예상 {estimated:,} > {self.max_bytes_per_query:,} bytes)"
+            )
+        ledger = self.ledger
+        ledger.check(label, estimated)
+
+        job = self.client.query(sql, job_config=bigquery.QueryJobConfig(
+            query_parameters=_bigquery_parameters(params),
+            maximum_bytes_billed=self.max_bytes_per_query
+        ))
+        rows = job.result()
+        ledger.record(
+            label=label,
+            backend=self.name,
+            bytes_estimated=estimated,
+            bytes_billed=job.total_bytes_billed or 0,
+            cache_hit=bool(job.cache_hit),
+            rows=rows.total_rows
+        )
+        return rows
+
+    def query_batches(self, sql: str, params: dict | None = None, label: str = "query"):
+        rows = self._run(sql, params, label)
+        if self.fetch_mode == "arrow":
+            yield from rows.to_arrow_iterable(bqstorage_client=self._get_bqstorage_client())
+        else:
+            yield from rows.to_arrow_iterable()
+
+    def query_arrow(self, sql: str, params: dict | None = None, label: str = "query") -> pa.Table:
+        # 결과가 비면 to_arrow_iterable 은 배치를 하나도 주지 않으므로,
+        # 컬럼(스키마)이 유지되는 to_arrow 로 한 번에 받는다
+        rows = self._run(sql, params, label)
+        if self.fetch_mode == "arrow":
+            return rows.to_arrow(bqstorage_client=self._get_bqstorage_client())
+        return rows.to_arrow(create_bqstorage_client=False)
+
+    def query(self, sql: str, params: dict | None = None, label: str = "query") -> pd.DataFrame:
+        if self.fetch_mode == "arrow":
+            return super().query(sql, params, label)
+        return self._run(sql, params, label).to_dataframe()
+
+
+class DuckDBBackend(DataBackend):
+    """
+    Parquet 복제본 위의 로컬 DuckDB 백엔드.
+
+    data_dir 아래에 논리 테이블 이름으로 된 `<table>.parquet` 파일 또는
+    `<table>/*.parquet` 디렉터리가 있어야 한다 (export_parquet_replica 로 생성).
+    BigQuery 문법의 `IN UNNEST(@name)` / `@name` 파라미터는 DuckDB 문법으로 바꿔 실행한다.
+    """
+
+    name = "duckdb"
+
+    def __init__(self, data_dir: str, **kwargs):
+        import duckdb  # 로컬 백엔드를 쓸 때만 필요
+
+        super().__init__(**kwargs)
+        self.data_dir = data_dir
+        self.conn = duckdb.connect(database=":memory:")
+
+        for table in TABLES + DERIVED_TABLES:
+            self._register(table)
+
+    def _register(self, table: str):
+        file_path = os.path.join(self.data_dir, f"{table}.parquet")
+        dir_path = os.path.join(self.data_dir, table)
+        if os.path.isfile(file_path):
+            source = file_path
+        elif os.path.isdir(dir_path):
+            source = os.path.join(dir_path, "*.parquet")
+        else:
+            return
+        self.conn.execute(
+            f"CREATE OR REPLACE VIEW {table} AS SELECT * FROM read_parquet('{source}')"
+        )
+
+    @property
+    def identity(self) -> str:
+        return f"{self.name}:{os.path.abspath(self.data_dir)}"
+
+    def table(self, logical_name: str) -> str:
+        return f'"{logical_name}"'
+
+    @staticmethod
+    def _translate(sql: str) -> str:
+        sql = re.sub(r"IN\s+UNNEST\(@(\w+)\)", r"IN (SELECT UNNEST($\1))", sql)
+        return re.sub(r"@(\w+)", r"$\1", sql)
+
+    def health_check(self):
+        self.conn.cursor().execute("SELECT 1").fetchall()
+
+    def write_table(self, logical_name: str, df: pd.DataFrame):
+        os.makedirs(self.data_dir, exist_ok=True)
+        df.to_parquet(os.path.join(self.data_dir, f"{logical_name}.parquet"), index=False)
+        self._register(logical_name)
+
+    def _execute(self, sql: str, params: dict | None, label: str):
+        # DuckDB 커넥션은 스레드 간 공유가 안 되므로 쿼리마다 커서를 연다
+        cursor = self.conn.cursor()
+        cursor.execute(self._translate(sql), params or {})
+        self.ledger.record(
+            label=label, backend=self.name, bytes_estimated=0, bytes_billed=0, cache_hit=False, rows=None
+        )
+        return cursor
+
+    def query_batches(self, sql: str, params: dict | None = None, label: str = "query"):
+        cursor = self._execute(sql, params, label)
+        try:
+            yield from cursor.fetch_record_batch()
+        finally:
+            cursor.close()
+
+    def query_arrow(self, sql: str, params: dict | None = None, label: str = "query") -> pa.Table:
+        cursor = self._execute(sql, params, label)
+        try:
+            # 최신 duckdb 의 arrow() 는 지연 RecordBatchReader 를 돌려주므로 커서를 닫기 전에 테이블로 받는다
+            return cursor.fetch_arrow_table()
+        finally:
+            cursor.close()
+
+    def query(self, sql: str, params: dict | None = None, label: str = "query") -> pd.DataFrame:
+        if self.fetch_mode == "arrow":
+            return super().query(sql, params, label)
+        cursor = self._execute(sql, params, label)
+        try:
+            return cursor.df()
+        finally:
+            cursor.close()
+
+
+def export_parquet_replica(backend: DataBackend, out_dir: str, limit: int | None = None):
+    """백엔드(보통 BigQuery)의 논리 테이블들을 Parquet 파일로 내려받아 로컬 복제본 생성"""
+    os.makedirs(out_dir, exist_ok=True)
+    for table in TABLES:
+        limit_clause = f"LIMIT {int(limit)}" if limit else ""
+        df = backend.query(f"SELECT * FROM {backend.table(table)} {limit_clause}", label=f"export_{table}")
+        df.to_parquet(os.path.join(out_dir, f"{table}.parquet"), index=False)
+        print(f"{table}: {len(df):,} rows")
+
+
+if __name__ == "__main__":
+    import argparse
+    from config import get_bigquery_backend, batch_max_bytes_per_query
+
+    parser = argparse.ArgumentParser(description="BigQuery 테이블을 Parquet 복제본으로 내려받기")
+    parser.add_argument("out_dir")
+    parser.add_argument("limit", type=int, nargs="?", default=None)
+    parser.add_argument("--max-bytes", type=int, default=batch_max_bytes_per_query,
+                        help="쿼리당 스캔 바이트 예산 (0 이면 제한 없음, 기본값 BATCH_MAX_BYTES_PER_QUERY)")
+    args = parser.parse_args()
+
+    export_parquet_replica(
+        get_bigquery_backend().with_budget(args.max_bytes),
+        args.out_dir,
+        args.limit
+    )
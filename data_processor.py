@@ -1,13 +1,105 @@
+import time
+import threading
+import datetime as dt
 import streamlit as st
 import pandas as pd
 
-from config import project_id, layer, product_table, review_table, \
-    predicted_review_table
+from concurrent.futures import Future, ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
+from config import predicted_review_refresh_seconds, predicted_review_window_days
+from cache_keys import make_fingerprint, tag_frame
+from review_frame import compact_review_frame
+from data_backend import QueryBudgetExceeded
+from instrumentation import instrument, measure_download, record_download
+from shared_cache import shared_cache
 
+
+@st.cache_resource
+def get_query_executor(max_workers=8):
+    """독립적인 쿼리·프리페치를 동시에 실행하는 프로세스 공용 스레드 풀"""
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="query")
+
+
+def submit_query(func, *args, **kwargs) -> Future:
+    """
+    func 를 쿼리 스레드 풀에서 실행한다.
+    호출한 스크립트의 실행 컨텍스트를 붙여 세션 상태(쿼리 원장 등)와 캐시를 그대로 사용한다.
+    """
+    ctx = get_script_run_ctx()
+
+    def run():
+        if ctx is not None:
+            add_script_run_ctx(ctx=ctx)
+        return func(*args, **kwargs)
+
+    return get_query_executor().submit(run)
+
+
+def run_concurrently(calls: dict) -> dict:
+    """{이름: (함수, 인자...)} 를 한꺼번에 제출하고 모두 끝나면 {이름: 결과} 반환"""
+    futures = {name: submit_query(*call) for name, call in calls.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def prefetch(func, *args, **kwargs) -> Future:
+    """다음 리런에서 쓸 가능성이 높은 캐시 로더를 미리 호출 (결과는 기다리지 않음)"""
+    return submit_query(func, *args, **kwargs)
+
+
+def date_range_predicates(start_date=None, end_date=None, column="created_at", run_date_column=None):
+    """
+    기간(시작일·종료일 포함, None 이면 열린 구간) → WHERE 절 조건 목록과 쿼리 파라미터.
+
+    created_at 범위를 TIMESTAMP 파라미터로 걸어 파티션·클러스터 가지치기가 되게 하고,
+    run_date_column 이 있으면 run_date >= 시작일 도 함께 건다.
+    리뷰는 작성된 뒤에 예측되므로 (run_date >= created_at 날짜) 결과를 바꾸지 않는 하한이다.
+    """
+    conditions, params = [], {}
+    if start_date is not None:
+        conditions.append(f"{column} >= @range_start")
+        params["range_start"] = dt.datetime.combine(start_date, dt.time.min)
+        if run_date_column:
+            conditions.append(f"{run_date_column} >= @range_start_date")
+            params["range_start_date"] = start_date
+    if end_date is not None:
+        conditions.append(f"{column} < @range_end")
+        params["range_end"] = dt.datetime.combine(end_date + dt.timedelta(days=1), dt.time.min)
+    return conditions, params
+
+
+def day_range_predicates(start_date=None, end_date=None, column="day"):
+    """DATE 컬럼(keyword_cube.day 등)용 기간 조건과 쿼리 파라미터"""
+    conditions, params = [], {}
+    if start_date is not None:
+        conditions.append(f"{column} >= @range_start_date")
+        params["range_start_date"] = start_date
+    if end_date is not None:
+        conditions.append(f"{column} <= @range_end_date")
+        params["range_end_date"] = end_date
+    return conditions, params
+
+
+def _and(conditions) -> str:
+    """조건 목록 → 기존 WHERE 절 뒤에 붙일 'AND ...' 문자열"""
+    return "".join(f"\n        AND {c}" for c in conditions)
+
+
+def _ensure_datetime(df, column='created_at'):
+    """Arrow 경로에서 이미 타임스탬프 타입으로 온 컬럼은 다시 파싱하지 않는다"""
+    if column in df.columns and not pd.api.types.is_datetime64_any_dtype(df[column]):
+        df[column] = pd.to_datetime(df[column])
+    return df
+
+
+
+@instrument(download=True)
 @st.cache_data
-def load_reviews(_client, limit=1000):
-    """BigQuery에서 기본 리뷰 데이터 로드"""
+@shared_cache()
+@measure_download
+def load_reviews(_backend, limit=1000, start_date=None, end_date=None):
+    """데이터 백엔드에서 기본 리뷰 데이터 로드 (start_date~end_date 기간만)"""
+    range_conditions, params = date_range_predicates(start_date, end_date)
 
     query = f"""
         SELECT 
@@ -18,22 +110,18 @@ def load_reviews(_client, limit=1000):
             category,
             platform,
             created_at
-        FROM `{project_id}.{layer}.{review_table}`
-        WHERE content IS NOT NULL and star > 0 
-        LIMIT {limit}
+        FROM {_backend.table("review")}
+        WHERE content IS NOT NULL and star > 0 {_and(range_conditions)}
+        LIMIT {int(limit)}
         """
-    df = _client.query(query).to_dataframe()
+    df = _backend.query(query, params, label="load_reviews")
     # 날짜 컬럼을 명시적으로 datetime으로 변환
-    df['created_at'] = pd.to_datetime(df['created_at'])
+    _ensure_datetime(df)
 
-    return df
+    return tag_frame(compact_review_frame(df), make_fingerprint("review", _backend.identity, limit, start_date, end_date))
 
 
-@st.cache_data
-def load_predicted_reviews(_client, limit=1000):
-    """BigQuery에서 predicted_reviews 데이터 로드"""
-    query = f"""
-    SELECT
+PREDICTED_REVIEW_COLUMNS = """
         review_uid,
         review_id,
         product_id,
@@ -46,24 +134,181 @@ def load_predicted_reviews(_client, limit=1000):
         platform,
         created_at,
         run_date
-    FROM `{project_id}.{layer}.{predicted_review_table}`  # 테이블명 변경
-    WHERE content IS NOT NULL and star > 0
-    ORDER BY created_at DESC
-    LIMIT {limit}
+"""
+
+
+class IncrementalReviewStore:
     """
-    df = _client.query(query).to_dataframe()
-    df['created_at'] = pd.to_datetime(df['created_at'])
-    return df
+    load_predicted_reviews 의 로컬 사본.
 
+    처음에는 최신 limit 개를 모두 받고, 이후에는 저장된 워터마크
+    (created_at, run_date 최댓값) 이후의 행만 받아 review_uid 기준으로 병합한다.
+    최신 created_at 에서 window_days 보다 오래된 행은 버린다.
+    start_date~end_date 기간 조건은 모든 쿼리에 들어가므로 기간마다 별도의 저장소를 쓴다.
+    반환하는 frame 은 여러 세션이 공유하므로 호출하는 쪽에서 수정하지 않는다.
+    """
 
-@st.cache_data
-def get_available_categories_and_platforms(_client):
-    """차원 테이블에서 사용 가능한 카테고리와 플랫폼 목록 조회"""
+    def __init__(self, limit: int, window_days: int | None = None, start_date=None, end_date=None):
+        self.limit = limit
+        self.window_days = window_days
+        self.start_date = start_date
+        self.end_date = end_date
+        self.frame: pd.DataFrame | None = None
+        self.created_watermark = None
+        self.run_date_watermark = None
+        self.refreshed_at = 0.0
+        self.version = 0
+        self._lock = threading.Lock()
 
+    def is_stale(self, refresh_interval: float) -> bool:
+        return self.frame is None or time.time() - self.refreshed_at >= refresh_interval
+
+    def full_query(self, backend) -> tuple[str, dict]:
+        """처음 로드할 때의 쿼리와 파라미터 (스캔 바이트 추정에도 사용)"""
+        range_conditions, params = date_range_predicates(
+            self.start_date, self.end_date, run_date_column="run_date"
+        )
+        query = f"""
+        SELECT {PREDICTED_REVIEW_COLUMNS}
+        FROM {backend.table("predicted_review")}
+        WHERE content IS NOT NULL and star > 0 {_and(range_conditions)}
+        ORDER BY created_at DESC
+        LIMIT {int(self.limit)}
+        """
+        return query, params
+
+    def _fetch_all(self, backend) -> pd.DataFrame:
+        query, params = self.full_query(backend)
+        return backend.query(query, params, label="load_predicted_reviews")
+
+    def _fetch_delta(self, backend) -> pd.DataFrame:
+        # 새로 들어온 리뷰(created_at) 또는 다시 예측된 리뷰(run_date)
+        range_conditions, params = date_range_predicates(
+            self.start_date, self.end_date, run_date_column="run_date"
+        )
+        query = f"""
+        SELECT {PREDICTED_REVIEW_COLUMNS}
+        FROM {backend.table("predicted_review")}
+        WHERE content IS NOT NULL and star > 0
+            AND (created_at > @created_after OR run_date > @run_date_after) {_and(range_conditions)}
+        ORDER BY created_at DESC
+        LIMIT {int(self.limit)}
+        """
+        return backend.query(
+            query,
+            {
+                "created_after": self.created_watermark.to_pydatetime(),
+                "run_date_after": self.run_date_watermark,
+                **params
+            },
+            label="load_predicted_reviews_delta"
+        )
+
+    def _merge(self, delta: pd.DataFrame) -> pd.DataFrame:
+        kept = self.frame[~self.frame["review_uid"].isin(delta["review_uid"])]
+        merged = pd.concat([kept, delta], ignore_index=True)
+        return merged.sort_values("created_at", ascending=False, kind="stable")
+
+    def _evict(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.window_days and not df.empty:
+            oldest = df["created_at"].max() - pd.Timedelta(days=self.window_days)
+            df = df[df["created_at"] >= oldest]
+        return df.head(self.limit).reset_index(drop=True)
+
+    def refresh(self, backend):
+        with self._lock:
+            if self.frame is None or self.frame.empty:
+                df = _ensure_datetime(self._fetch_all(backend))
+                record_download(df)
+            else:
+                delta = _ensure_datetime(self._fetch_delta(backend))
+                record_download(delta)
+                df = self._merge(delta) if not delta.empty else None
+
+            if df is not None:
+                self.frame = compact_review_frame(self._evict(df))
+                if not self.frame.empty:
+                    self.created_watermark = self.frame["created_at"].max()
+                    self.run_date_watermark = pd.Timestamp(self.frame["run_date"].max()).date()
+                self.version += 1
+                tag_frame(self.frame, make_fingerprint(
+                    "predicted_review", backend.identity, self.limit, self.window_days, self.start_date, self.end_date,
+                    self.created_watermark, self.run_date_watermark, self.version
+                ))
+            self.refreshed_at = time.time()
+
+
+# 저장소 하나가 최대 limit 개의 원본 리뷰를 들고 있으므로, 프리셋(매일 시작일이 바뀜)과
+# 직접 선택한 기간마다 저장소가 쌓이지 않게 개수와 수명을 제한한다
+PREDICTED_REVIEW_STORE_MAX_ENTRIES = 4
+PREDICTED_REVIEW_STORE_TTL_SECONDS = 6 * 3600
+
+
+@st.cache_resource(
+    show_spinner=False,
+    max_entries=PREDICTED_REVIEW_STORE_MAX_ENTRIES,
+    ttl=PREDICTED_REVIEW_STORE_TTL_SECONDS
+)
+def get_predicted_review_store(limit, window_days=None, start_date=None, end_date=None):
+    """limit·보관 기간·조회 기간별로 프로세스 내에서 공유하는 IncrementalReviewStore (최근 몇 개만 유지)"""
+    return IncrementalReviewStore(limit, window_days, start_date, end_date)
+
+
+@instrument(download=True)
+def load_predicted_reviews(
+    _backend,
+    limit=1000,
+    refresh_interval=predicted_review_refresh_seconds,
+    window_days=predicted_review_window_days,
+    start_date=None,
+    end_date=None
+):
+    """데이터 백엔드에서 predicted_reviews 데이터 로드 (워터마크 기반 증분 갱신, start_date~end_date 기간만)"""
+    store = get_predicted_review_store(int(limit), window_days, start_date, end_date)
+    if store.is_stale(refresh_interval):
+        store.refresh(_backend)
+    return store.frame
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def estimate_scan_bytes(_backend, limit=1000, start_date=None, end_date=None) -> tuple[int | None, int | None]:
+    """
+    predicted_reviews 로딩 쿼리가 이 기간에 스캔할 예상 바이트와 전체 기간일 때의 예상 바이트 (드라이런).
+
+    드라이런은 과금되지 않는다. 추정할 수 없는 백엔드(로컬 DuckDB 는 0)이거나 실패하면 None.
+    """
+    try:
+        estimates = [
+            _backend.estimate_bytes(*IncrementalReviewStore(int(limit), None, start, end).full_query(_backend))
+            for start, end in [(start_date, end_date), (None, None)]
+        ]
+    except Exception:
+        return None, None
+    return tuple(e or None for e in estimates)
+
+
+@instrument(download=True)
+def get_available_categories_and_platforms(_backend):
+    """차원 테이블에서 사용 가능한 카테고리와 플랫폼 목록 조회 (실패하면 빈 목록, 캐시하지 않음)"""
+    try:
+        return _load_categories_and_platforms(_backend)
+    except QueryBudgetExceeded:
+        raise
+    except Exception as e:
+        st.error(f"카테고리/플랫폼 데이터 조회 실패: {str(e)}")
+        return [], []
+
+
+# 조회 실패 시의 빈 결과가 (공유) 캐시에 남지 않도록 예외는 캐시된 함수 밖에서 처리한다
+@st.cache_data
+@shared_cache()
+@measure_download
+def _load_categories_and_platforms(_backend):
+    """카테고리·플랫폼 조회 본체 (성공한 결과만 캐시)"""
     # dim_category에서 standard_category 조회
     category_query = f"""
     SELECT DISTINCT standard_category
-    FROM `{project_id}.{layer}.dim_category`
+    FROM {_backend.table("dim_category")}
     WHERE standard_category IS NOT NULL
     ORDER BY standard_category
     """
@@ -71,52 +316,65 @@ def get_available_categories_and_platforms(_client):
     # dim_platform에서 platform 조회
     platform_query = f"""
     SELECT DISTINCT platform
-    FROM `{project_id}.{layer}.dim_platform`
+    FROM {_backend.table("dim_platform")}
     WHERE platform IS NOT NULL
     ORDER BY platform
     """
 
-    try:
-        categories_df = _client.query(category_query).to_dataframe()
-        platforms_df = _client.query(platform_query).to_dataframe()
+    # 두 차원 테이블 쿼리는 서로 독립적이므로 동시에 실행
+    results = run_concurrently({
+        "categories": (_backend.query, category_query, None, "dim_category"),
+        "platforms": (_backend.query, platform_query, None, "dim_platform")
+    })
+    categories = results["categories"]['standard_category'].tolist()
+    platforms = results["platforms"]['platform'].tolist()
+
+    return categories, platforms
 
-        categories = categories_df['standard_category'].tolist()
-        platforms = platforms_df['platform'].tolist()
 
-        return categories, platforms
+@instrument(download=True)
+def load_products_for_selection(_backend, categories=None, platforms=None, limit=100, start_date=None, end_date=None):
+    """상품 선택용 데이터 로드 - 차원 테이블 조인 및 필터 적용 (리뷰 수는 start_date~end_date 기간 기준)"""
+    try:
+        return _load_products_for_selection(_backend, categories, platforms, limit, start_date, end_date)
+    except QueryBudgetExceeded:
+        raise
     except Exception as e:
-        st.error(f"카테고리/플랫폼 데이터 조회 실패: {str(e)}")
-        return [], []
+        st.error(f"상품 데이터 조회 실패: {str(e)}")
+        return pd.DataFrame()
 
 
 @st.cache_data
-def load_products_for_selection(_client, categories=None, platforms=None, limit=100):
-    """상품 선택용 데이터 로드 - 차원 테이블 조인 및 필터 적용"""
-
-    # WHERE 절 조건 구성
+@shared_cache()
+@measure_download
+def _load_products_for_selection(_backend, categories, platforms, limit, start_date, end_date):
+    """상품 선택용 조회 본체 (성공한 결과만 캐시)"""
+    # WHERE 절 조건 구성 (값은 쿼리 파라미터로 전달)
     where_conditions = ["p.product_id IS NOT NULL"]
+    params = {}
 
     # 선택된 카테고리 필터 (standard_category -> original_category 매핑)
     if categories and len(categories) > 0:
-        category_list = "', '".join(categories)
-        where_conditions.append(f"dc.standard_category IN ('{category_list}')")
+        where_conditions.append("dc.standard_category IN UNNEST(@categories)")
+        params["categories"] = list(categories)
 
     # 선택된 플랫폼 필터
     if platforms and len(platforms) > 0:
-        platform_list = "', '".join(platforms)
-        where_conditions.append(f"dp.platform IN ('{platform_list}')")
+        where_conditions.append("dp.platform IN UNNEST(@platforms)")
+        params["platforms"] = list(platforms)
 
     where_clause = " AND ".join(where_conditions)
+    range_conditions, range_params = date_range_predicates(start_date, end_date, run_date_column="run_date")
+    params.update(range_params)
 
     query = f"""
     WITH top_reviewed_products AS (
         SELECT
             product_id,
             COUNT(*) AS review_count_from_reviews
-        FROM `{project_id}.{layer}.{predicted_review_table}`
-        WHERE product_id IS NOT NULL
+        FROM {_backend.table("predicted_review")}
+        WHERE product_id IS NOT NULL {_and(range_conditions)}
         GROUP BY product_id
-        ORDER BY COUNT(*) DESC
     )
     SELECT
         p.product_id,
@@ -130,29 +388,29 @@ def load_products_for_selection(_client, categories=None, platforms=None, limit=
         p.platform,
         dp.description as platform_description,
         trp.review_count_from_reviews
-    FROM `{project_id}.{layer}.{product_table}` p
+    FROM {_backend.table("product")} p
     INNER JOIN top_reviewed_products trp
         ON p.product_id = trp.product_id
-    LEFT JOIN `{project_id}.{layer}.dim_category` dc
+    LEFT JOIN {_backend.table("dim_category")} dc
         ON p.category = dc.original_category  -- original_category로 매핑
         AND p.platform = dc.platform         -- platform도 고려
-    LEFT JOIN `{project_id}.{layer}.dim_platform` dp
+    LEFT JOIN {_backend.table("dim_platform")} dp
         ON p.platform = dp.platform
     WHERE {where_clause}
     ORDER BY trp.review_count_from_reviews DESC
-    LIMIT {limit}
+    LIMIT {int(limit)}
     """
 
-    try:
-        return _client.query(query).to_dataframe()
-    except Exception as e:
-        st.error(f"상품 데이터 조회 실패: {str(e)}")
-        return pd.DataFrame()
+    return _backend.query(query, params, label="load_products_for_selection")
 
 
+@instrument(download=True)
 @st.cache_data
-def load_product_reviews_with_sentiment(_client, product_id, limit=300):
+@shared_cache()
+@measure_download
+def load_product_reviews_with_sentiment(_backend, product_id, limit=300, start_date=None, end_date=None):
     """선택된 상품의 predicted_reviews 데이터 로드"""
+    range_conditions, params = date_range_predicates(start_date, end_date, run_date_column="run_date")
     query = f"""
     SELECT
         review_id,
@@ -163,18 +421,197 @@ def load_product_reviews_with_sentiment(_client, product_id, limit=300):
         is_correct,
         created_at,
         platform
-    FROM `{project_id}.{layer}.{predicted_review_table}`
-    WHERE product_id = '{product_id}'
+    FROM {_backend.table("predicted_review")}
+    WHERE product_id = @product_id
         AND content IS NOT NULL
-        AND star > 0
+        AND star > 0 {_and(range_conditions)}
     ORDER BY created_at DESC
-    LIMIT {limit}
+    LIMIT {int(limit)}
     """
 
-    df = _client.query(query).to_dataframe()
+    df = _backend.query(query, {"product_id": product_id, **params}, label="load_product_reviews_with_sentiment")
     if not df.empty:
-        df['created_at'] = pd.to_datetime(df['created_at'])
+        _ensure_datetime(df)
         # 기존 sentiment 컬럼을 pred_label로 대체
         df['sentiment'] = df['pred_label']
 
     return df
+
+
+@instrument(download=True)
+@st.cache_data
+@shared_cache()
+@measure_download
+def load_product_sentiment_summary(_backend, product_id, start_date=None, end_date=None):
+    """선택된 상품의 기간 내 전체 리뷰에 대한 감성·별점별 집계 (원본 리뷰는 내려받지 않음)"""
+    range_conditions, params = date_range_predicates(start_date, end_date, run_date_column="run_date")
+    query = f"""
+    SELECT
+        pred_label,
+        star,
+        COUNT(*) AS review_count,
+        SUM(CASE WHEN is_correct THEN 1 ELSE 0 END) AS correct_count,
+        COUNT(is_correct) AS labeled_count
+    FROM {_backend.table("predicted_review")}
+    WHERE product_id = @product_id
+        AND content IS NOT NULL
+        AND star > 0 {_and(range_conditions)}
+    GROUP BY pred_label, star
+    ORDER BY pred_label, star
+    """
+
+    return _backend.query(query, {"product_id": product_id, **params}, label="load_product_sentiment_summary")
+
+
+# 샘플 리뷰 정렬 옵션 → ORDER BY 절
+SAMPLE_ORDER_BY = {
+    "최신순": "created_at DESC",
+    "오래된순": "created_at ASC",
+    "별점 높은순": "star DESC, created_at DESC",
+    "별점 낮은순": "star ASC, created_at DESC"
+}
+
+
+@instrument(download=True)
+@st.cache_data
+@shared_cache()
+@measure_download
+def load_product_review_samples(
+    _backend, product_id, sentiment, sort_by="최신순", limit=15, offset=0, start_date=None, end_date=None
+):
+    """선택된 상품의 특정 감성 리뷰 샘플만 정렬해서 로드 (offset 으로 페이지 단위 조회)"""
+    range_conditions, params = date_range_predicates(start_date, end_date, run_date_column="run_date")
+    query = f"""
+    SELECT
+        review_id,
+        content,
+        star,
+        pred_label,
+        true_label,
+        is_correct,
+        created_at,
+        platform
+    FROM {_backend.table("predicted_review")}
+    WHERE product_id = @product_id
+        AND pred_label = @sentiment
+        AND content IS NOT NULL
+        AND star > 0 {_and(range_conditions)}
+    ORDER BY {SAMPLE_ORDER_BY[sort_by]}, review_id
+    LIMIT {int(limit)} OFFSET {int(offset)}
+    """
+
+    df = _backend.query(
+        query,
+        {"product_id": product_id, "sentiment": sentiment, **params},
+        label="load_product_review_samples"
+    )
+    if not df.empty:
+        _ensure_datetime(df)
+        df['sentiment'] = df['pred_label']
+
+    return df
+
+
+@instrument(download=True)
+@st.cache_data
+@shared_cache()
+@measure_download
+def load_keyword_cube(_backend, platforms, categories, min_length=2, top_n=50, start_date=None, end_date=None):
+    """사전 집계된 keyword_cube 를 선택한 플랫폼·카테고리·기간으로 키워드별 롤업"""
+    range_conditions, params = day_range_predicates(start_date, end_date)
+    query = f"""
+    SELECT
+        keyword,
+        SUM(frequency) AS frequency,
+        SUM(review_count) AS review_count,
+        SUM(positive_count) AS positive_count,
+        SUM(star_sum) AS star_sum
+    FROM {_backend.table("keyword_cube")}
+    WHERE platform IN UNNEST(@platforms)
+        AND category IN UNNEST(@categories)
+        AND LENGTH(keyword) >= @min_length {_and(range_conditions)}
+    GROUP BY keyword
+    ORDER BY frequency DESC
+    LIMIT {int(top_n)}
+    """
+
+    return _backend.query(
+        query,
+        {"platforms": list(platforms), "categories": list(categories), "min_length": int(min_length), **params},
+        label="load_keyword_cube"
+    )
+
+
+@instrument(download=True)
+@st.cache_data
+@shared_cache()
+@measure_download
+def load_keyword_cube_daily(_backend, platforms, categories, keywords, start_date=None, end_date=None):
+    """keyword_cube 에서 선택한 키워드의 기간 내 일자별 합계 (트렌드 카운터용)"""
+    range_conditions, params = day_range_predicates(start_date, end_date)
+    query = f"""
+    SELECT
+        keyword,
+        day,
+        SUM(review_count) AS review_count,
+        SUM(positive_count) AS positive_count,
+        SUM(negative_count) AS negative_count,
+        SUM(star_sum) AS star_sum
+    FROM {_backend.table("keyword_cube")}
+    WHERE platform IN UNNEST(@platforms)
+        AND category IN UNNEST(@categories)
+        AND keyword IN UNNEST(@keywords) {_and(range_conditions)}
+    GROUP BY keyword, day
+    ORDER BY day
+    """
+
+    return _backend.query(
+        query,
+        {"platforms": list(platforms), "categories": list(categories), "keywords": list(keywords), **params},
+        label="load_keyword_cube_daily"
+    )
+
+
+@instrument(download=True)
+@st.cache_data
+@shared_cache()
+@measure_download
+def load_keyword_cube_dimensions(_backend, start_date=None, end_date=None):
+    """keyword_cube 에 있는 플랫폼·카테고리 목록 (사전 집계 모드의 필터 옵션)"""
+    range_conditions, params = day_range_predicates(start_date, end_date)
+    query = f"""
+    SELECT DISTINCT platform, category
+    FROM {_backend.table("keyword_cube")}
+    WHERE platform IS NOT NULL
+        AND category IS NOT NULL {_and(range_conditions)}
+    ORDER BY platform, category
+    """
+
+    return _backend.query(query, params, label="load_keyword_cube_dimensions")
+
+
+@instrument(download=True)
+@st.cache_data
+@shared_cache()
+@measure_download
+def load_review_totals(_backend, platforms, categories, start_date=None, end_date=None):
+    """
+    선택한 플랫폼·카테고리·기간 전체 리뷰의 수·평균 별점.
+    content 컬럼을 스캔하지 않도록 본문 NULL 조건은 걸지 않는다 (본문 없는 리뷰도 세어진다).
+    """
+    range_conditions, params = date_range_predicates(start_date, end_date, run_date_column="run_date")
+    query = f"""
+    SELECT
+        COUNT(*) AS review_count,
+        AVG(star) AS avg_rating
+    FROM {_backend.table("predicted_review")}
+    WHERE star > 0
+        AND platform IN UNNEST(@platforms)
+        AND category IN UNNEST(@categories) {_and(range_conditions)}
+    """
+
+    return _backend.query(
+        query,
+        {"platforms": list(platforms), "categories": list(categories), **params},
+        label="load_review_totals"
+    )
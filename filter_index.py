@@ -0,0 +1,72 @@
+"""
+플랫폼·카테고리 필터 인덱스
+데이터셋을 로드할 때 한 번, 컬럼 값별 행 비트맵(np.packbits)을 만들어 두고
+멀티셀렉트 조합은 비트 OR(같은 컬럼) / AND(다른 컬럼)로 행 번호를 구한다.
+"""
+import hashlib
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+class FilterIndex:
+    """컬럼 값 → 행 비트맵"""
+
+    def __init__(self, df: pd.DataFrame, columns=("platform", "category"), dataset_key: str = ""):
+        self.n_rows = len(df)
+        self.dataset_key = dataset_key
+        self.bitmaps: dict[str, dict] = {}
+
+        for column in columns:
+            codes, uniques = pd.factorize(df[column], sort=True)
+            self.bitmaps[column] = {
+                value: np.packbits(codes == code)
+                for code, value in enumerate(uniques)
+            }
+
+    def values(self, column: str) -> list:
+        """컬럼의 값 목록 (정렬됨)"""
+        return list(self.bitmaps[column].keys())
+
+    def _column_bits(self, column: str, values) -> np.ndarray | None:
+        """선택된 값들의 비트맵 OR - 전체 선택이면 None (필터 없음)"""
+        bitmaps = self.bitmaps[column]
+        selected = set(values)
+        if selected >= bitmaps.keys():
+            return None
+
+        bits = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for value in selected:
+            if value in bitmaps:
+                np.bitwise_or(bits, bitmaps[value], out=bits)
+        return bits
+
+    def select(self, selection: dict) -> np.ndarray:
+        """{컬럼: 선택 값 목록} 조합에 해당하는 행 번호(오름차순)"""
+        combined = None
+        for column, values in selection.items():
+            bits = self._column_bits(column, values)
+            if bits is None:
+                continue
+            combined = bits if combined is None else np.bitwise_and(combined, bits)
+
+        if combined is None:
+            return np.arange(self.n_rows)
+        return np.flatnonzero(np.unpackbits(combined, count=self.n_rows))
+
+    def selection_key(self, selection: dict) -> str:
+        """데이터셋 + 선택 조합의 결정적 키 (선택 순서와 무관)"""
+        parts = [self.dataset_key]
+        for column in sorted(selection):
+            values = set(selection[column])
+            if values >= self.bitmaps[column].keys():
+                parts.append(f"{column}=*")
+            else:
+                parts.append(f"{column}=" + ",".join(sorted(map(str, values))))
+        return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_filter_index(_df: pd.DataFrame, dataset_key: str, columns=("platform", "category")) -> FilterIndex:
+    """데이터셋(dataset_key)마다 한 번만 만드는 FilterIndex"""
+    return FilterIndex(_df, columns, dataset_key)
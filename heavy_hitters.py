@@ -0,0 +1,196 @@
+"""
+고정 메모리 상위 키워드(heavy hitters) 스트리밍 집계
+1) SpaceSaving     ─ 최대 capacity 개 후보만 유지, 과대 추정 상한(error) 보장
+2) CountMinSketch  ─ width × depth 카운터 배열, 모든 항목의 과대 추정치
+3) HeavyHitters    ─ 두 구조를 함께 써서 후보별 [하한, 상한] 구간으로 top-N 보고
+
+어휘(vocabulary) 크기나 입력 리뷰 수와 관계없이 메모리가 capacity·width·depth 로 고정된다.
+"""
+import heapq
+import math
+import zlib
+from collections import Counter
+
+import numpy as np
+
+
+class SpaceSaving:
+    """
+    Space-Saving 알고리즘 (Metwally et al.).
+
+    추적 중인 항목 x 의 카운트 c(x) 와 오차 e(x) 에 대해
+    c(x) - e(x) <= 실제 빈도 <= c(x) 가 항상 성립하고,
+    실제 빈도가 N / capacity 보다 큰 항목은 반드시 추적된다 (N: 전체 누적 수).
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity 는 1 이상이어야 합니다.")
+        self.capacity = capacity
+        self.total = 0
+        self._counts: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+        # (count, item) 최소 힙 - 카운트가 바뀐 항목은 지연 삭제(lazy)로 처리
+        self._heap: list[tuple[int, str]] = []
+
+    def __len__(self):
+        return len(self._counts)
+
+    def _pop_min(self) -> tuple[int, str]:
+        while True:
+            count, item = heapq.heappop(self._heap)
+            if self._counts.get(item) == count:
+                return count, item
+
+    def _compact_heap(self):
+        # 지연 삭제로 쌓인 낡은 항목이 너무 많아지면 힙을 다시 만든다
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, item) for item, c in self._counts.items()]
+            heapq.heapify(self._heap)
+
+    def update(self, item: str, count: int = 1):
+        self.total += count
+        if item in self._counts:
+            self._counts[item] += count
+        elif len(self._counts) < self.capacity:
+            self._counts[item] = count
+            self._errors[item] = 0
+        else:
+            # 가장 작은 카운트를 가진 항목을 밀어내고 그 값을 오차로 물려받는다
+            min_count, evicted = self._pop_min()
+            del self._counts[evicted]
+            del self._errors[evicted]
+            self._counts[item] = min_count + count
+            self._errors[item] = min_count
+        heapq.heappush(self._heap, (self._counts[item], item))
+        self._compact_heap()
+
+    def update_many(self, counts: Counter):
+        for item, count in counts.items():
+            self.update(item, count)
+
+    @property
+    def max_error(self) -> int:
+        """추적 항목 전체에 대한 과대 추정 상한 (<= N / capacity)"""
+        return max(self._errors.values(), default=0)
+
+    def items(self):
+        """(item, count, error) - 카운트 내림차순"""
+        return sorted(
+            ((item, c, self._errors[item]) for item, c in self._counts.items()),
+            key=lambda t: (-t[1], t[0])
+        )
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch (Cormode & Muthukrishnan).
+
+    estimate(x) >= 실제 빈도 이고, 확률 1 - delta 이상으로
+    estimate(x) <= 실제 빈도 + epsilon × N 이다 (epsilon = e / width, delta = e^-depth).
+    """
+
+    def __init__(self, width: int = 2 ** 14, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._table = np.zeros((depth, width), dtype=np.int64)
+        self._rows = np.arange(depth)
+
+    @classmethod
+    def from_error(cls, epsilon: float, delta: float) -> "CountMinSketch":
+        """목표 오차(epsilon × N)와 실패 확률(delta)로 크기 결정"""
+        return cls(width=math.ceil(math.e / epsilon), depth=math.ceil(math.log(1 / delta)))
+
+    @property
+    def epsilon(self) -> float:
+        return math.e / self.width
+
+    @property
+    def delta(self) -> float:
+        return math.exp(-self.depth)
+
+    def _buckets(self, item: str) -> np.ndarray:
+        # 프로세스마다 달라지는 hash() 대신 고정 시드 crc32 - 스케치를 다른 프로세스와 합칠 수 있다
+        data = item.encode("utf-8")
+        return np.fromiter(
+            (zlib.crc32(data, seed) % self.width for seed in range(self.depth)),
+            dtype=np.int64, count=self.depth
+        )
+
+    def update(self, item: str, count: int = 1):
+        self.total += count
+        self._table[self._rows, self._buckets(item)] += count
+
+    def update_many(self, counts: Counter):
+        for item, count in counts.items():
+            self.update(item, count)
+
+    def estimate(self, item: str) -> int:
+        return int(self._table[self._rows, self._buckets(item)].min())
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        if (self.width, self.depth) != (other.width, other.depth):
+            raise ValueError("크기가 다른 Count-Min sketch 는 합칠 수 없습니다.")
+        self._table += other._table
+        self.total += other.total
+        return self
+
+
+class HeavyHitters:
+    """
+    Space-Saving 으로 후보를 고르고 Count-Min 으로 상한을 좁힌 top-N 집계.
+
+    top(n) 의 각 항목은 실제 빈도가 [lower, upper] 안에 있음이 보장되고
+    (upper 의 Count-Min 부분은 확률 1 - delta), guaranteed=True 인 항목은
+    n+1 번째 후보의 상한보다 하한이 커서 실제 top-N 에 들어감이 확실하다.
+    """
+
+    def __init__(self, capacity: int = 5_000, width: int = 2 ** 14, depth: int = 4):
+        self.space_saving = SpaceSaving(capacity)
+        self.count_min = CountMinSketch(width, depth)
+
+    def __len__(self):
+        return len(self.space_saving)
+
+    @property
+    def total(self) -> int:
+        return self.space_saving.total
+
+    def update(self, counts: Counter):
+        """항목별 개수(Counter)를 누적 - Counter.update 와 같은 방식으로 쓸 수 있다"""
+        self.space_saving.update_many(counts)
+        self.count_min.update_many(counts)
+
+    def top(self, n: int) -> list[dict]:
+        candidates = []
+        for item, count, error in self.space_saving.items():
+            upper = min(count, self.count_min.estimate(item))
+            candidates.append({"keyword": item, "lower": count - error, "upper": upper})
+        # 상한 기준 정렬 (동률이면 하한, 키워드 순) - 결과 순서를 결정적으로 유지
+        candidates.sort(key=lambda c: (-c["upper"], -c["lower"], c["keyword"]))
+
+        # 밀려난 항목의 실제 빈도는 SpaceSaving 최소 카운트를 넘을 수 없다
+        evicted_bound = min((c for _, c, _ in self.space_saving.items()), default=0) \
+            if len(self.space_saving) >= self.space_saving.capacity else 0
+        next_upper = candidates[n]["upper"] if len(candidates) > n else evicted_bound
+        next_upper = max(next_upper, evicted_bound)
+
+        top = candidates[:n]
+        for c in top:
+            c["guaranteed"] = c["lower"] > next_upper
+        return top
+
+    def most_common(self, n: int) -> list[tuple[str, int]]:
+        """Counter.most_common 과 같은 형태 (빈도는 추정 상한)"""
+        return [(c["keyword"], c["upper"]) for c in self.top(n)]
+
+    def error_bounds(self) -> dict:
+        """현재 누적량 기준의 오차 한계 요약"""
+        return {
+            "total": self.total,
+            "space_saving_max_error": self.space_saving.max_error,
+            "space_saving_bound": self.total / self.space_saving.capacity,
+            "count_min_bound": self.count_min.epsilon * self.count_min.total,
+            "count_min_delta": self.count_min.delta
+        }
@@ -0,0 +1,176 @@
+"""
+단계별 성능 계측
+로더·분석·차트 함수마다 벽시계 시간, 처리 행 수, 청구/다운로드 바이트, RSS(와 단계 중 증감)를
+리런 단위로 기록하고 사이드바 패널과 구조화 로그(JSON)로 내보낸다.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import functools
+import contextlib
+import pandas as pd
+import streamlit as st
+from streamlit import runtime
+
+
+logger = logging.getLogger("visualization.perf")
+
+_SESSION_KEY = "stage_timings"
+# 지금 실행 중인 stage 의 기록 (measure_payload 가 캐시 미스 때 채운다)
+_active = threading.local()
+
+
+def _enabled() -> bool:
+    # streamlit run 밖(벤치마크, 워커 프로세스)에서는 기록하지 않는다
+    return runtime.exists()
+
+
+try:
+    import resource  # Unix 전용
+except ImportError:
+    resource = None
+
+
+def _rss_mb() -> float | None:
+    """현재 RSS (MB) - /proc 이 없으면 프로세스 최대 RSS 로 대신하고, 둘 다 없으면 None"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        # ru_maxrss 단위는 Linux 가 KB, macOS 가 bytes
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss / 1024 ** 2 if sys.platform == "darwin" else max_rss / 1024
+    return None
+
+
+def _bytes_billed() -> int:
+    ledger = st.session_state.get("query_ledger")
+    return ledger.total_bytes_billed if ledger is not None else 0
+
+
+def start_rerun():
+    """리런 시작 시 이전 기록을 비운다"""
+    if _enabled():
+        st.session_state[_SESSION_KEY] = []
+
+
+def get_stage_timings() -> pd.DataFrame:
+    """이번 리런의 단계별 기록"""
+    if not _enabled():
+        return pd.DataFrame()
+    return pd.DataFrame(st.session_state.get(_SESSION_KEY, []))
+
+
+@contextlib.contextmanager
+def stage(name: str, **info):
+    """
+    with stage("이름") as record: ... 형태로 구간을 계측한다.
+    record 에 rows / bytes_downloaded 등을 채워 넣으면 함께 기록된다.
+    """
+    if not _enabled():
+        yield {}
+        return
+
+    record = {"stage": name, **info}
+    billed_before = _bytes_billed()
+    rss_before = _rss_mb()
+    started = time.perf_counter()
+    outer, _active.record = getattr(_active, "record", None), record
+    try:
+        yield record
+    finally:
+        _active.record = outer
+        record["seconds"] = time.perf_counter() - started
+        record["bytes_billed"] = _bytes_billed() - billed_before
+        # 단계별 최댓값이 아니라 단계 종료 시점의 RSS 와 단계 동안의 증감
+        record["rss_mb"] = _rss_mb()
+        if rss_before is not None and record["rss_mb"] is not None:
+            record["rss_delta_mb"] = record["rss_mb"] - rss_before
+        st.session_state.setdefault(_SESSION_KEY, []).append(record)
+        logger.info(json.dumps(record, ensure_ascii=False, default=str))
+
+
+def instrument(name: str | None = None, *, download: bool = False):
+    """
+    함수 호출을 stage 로 감싸는 데코레이터 (캐시 데코레이터보다 바깥에 둔다).
+    download=True 이면 cache_hit 을 기록한다 - 캐시 안쪽의 measure_download(또는 record_download)가
+    실행되지 않았으면 히트로 보고 다운로드 바이트는 남기지 않는다.
+    """
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(stage_name) as record:
+                if download:
+                    record["cache_hit"] = True
+                result = func(*args, **kwargs)
+                if isinstance(result, (pd.DataFrame, list)):
+                    record["rows"] = len(result)
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+def record_download(df):
+    """실제로 내려받은 DataFrame 의 메모리 크기를 지금 stage 의 다운로드 바이트로 더한다"""
+    record = getattr(_active, "record", None)
+    if record is None:
+        return
+    record["cache_hit"] = False
+    if isinstance(df, pd.DataFrame):
+        record["bytes_downloaded"] = record.get("bytes_downloaded", 0) + int(df.memory_usage(deep=True).sum())
+
+
+def measure_download(func):
+    """
+    캐시 데코레이터 안쪽에 두어 쿼리를 실제로 실행했을 때만(캐시 미스) 다운로드 바이트를 기록한다.
+    히트마다 memory_usage(deep=True) 로 결과를 훑는 비용도 생기지 않는다.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        record_download(result)
+        return result
+
+    return wrapper
+
+
+def measure_payload(func):
+    """
+    결과 Plotly figure 를 직렬화한 JSON 크기를 브라우저 전송 바이트(payload_bytes)로 기록한다.
+    캐시 데코레이터 안쪽에 두어 캐시 미스일 때만 직렬화한다 (히트면 비어 있음).
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        record = getattr(_active, "record", None)
+        if record is not None and hasattr(result, "to_json"):
+            record["payload_bytes"] = len(result.to_json())
+        return result
+
+    return wrapper
+
+
+def show_stage_panel():
+    """사이드바에 이번 리런의 단계별 성능 표시 + JSON 내보내기"""
+    timings = get_stage_timings()
+    with st.sidebar.expander("⏱️ 단계별 성능"):
+        if timings.empty:
+            st.caption("기록된 단계가 없습니다.")
+            return
+        st.caption(f"총 {timings['seconds'].sum():.2f}초 / 단계 종료 시 최대 RSS {timings['rss_mb'].max():,.0f} MB")
+        st.dataframe(timings, use_container_width=True)
+        st.download_button(
+            label="📥 JSON 내보내기",
+            data=timings.to_json(orient="records", force_ascii=False),
+            file_name=f"stage_timings_{pd.Timestamp.now():%Y%m%d_%H%M%S}.json",
+            mime="application/json"
+        )
@@ -1,52 +1,390 @@
 """
 한국어 텍스트 처리 관련 로직
-1) 키워드 추출 함수  ─ extract_keywords_batch
-2) 키워드별 감성·통계 집계 ─ calculate_keyword_sentiment_streaming
+1) 형태소 분석 풀    ─ get_tokenizer_pool / start_tokenizer_warmup (백엔드: noun_tokenizers)
+2) 키워드 추출 함수  ─ extract_keywords_batch / stream_keywords (리뷰별 토큰 캐시: tokenize_reviews)
+3) 다중 키워드 매칭 ─ build_keyword_matcher / match_keywords
+4) 키워드별 감성·통계 집계 ─ calculate_keyword_sentiment_streaming
 """
+import os
 import re
+import time
+import threading
+import multiprocessing
 import streamlit as st
+import numpy as np
 import pandas as pd
 
-from konlpy.tag import Okt
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, BrokenExecutor
 
+from cache_keys import fingerprint_cache
+from instrumentation import instrument
+from noun_tokenizers import get_tokenizer, tokenizer_store_key
+from token_store import get_token_store
 
-@st.cache_data(show_spinner=False)
+
+_worker_stats_lock = threading.Lock()
+_last_worker_stats: list[dict] = []
+
+
+def _warm_up_worker(tokenizer: str = "okt"):
+    """풀 워커 초기화 시 형태소 분석기(Okt 는 JVM)를 미리 띄워 둔다"""
+    get_tokenizer(tokenizer).nouns("워밍업")
+
+
+@st.cache_resource(show_spinner=False)
+def start_tokenizer_warmup(tokenizer: str = "okt") -> threading.Thread:
+    """프로세스당 한 번, 백그라운드 스레드에서 형태소 분석기를 미리 띄운다"""
+    thread = threading.Thread(
+        target=_warm_up_worker, args=(tokenizer,), name=f"{tokenizer}-warmup", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+@st.cache_resource(show_spinner=False)
+def get_tokenizer_pool(kind: str = "thread", workers: int = 1, tokenizer: str = "okt"):
+    """
+    프로세스 수명 동안 유지되는 형태소 분석 실행 풀 (형태소 분석기별로 하나).
+
+    kind="thread"  : JPype·Kiwi 는 분석 중 GIL 을 놓으므로 스레드마다 인스턴스를 두고 병렬 처리
+    kind="process" : 프로세스마다 인스턴스(Okt 는 JVM)를 하나씩 띄운다 (spawn - JVM 이 뜬 프로세스는 fork 불가)
+
+    스레드 풀은 만들기 전에 호출한 스레드에서 먼저 분석기를 띄운다. 실패하면 예외가 나서
+    캐시되지 않고, 성공하면 워커 초기화는 이미 뜬 JVM 에 붙기만 한다.
+    """
+    if kind == "process":
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_up_worker,
+            initargs=(tokenizer,)
+        )
+    _warm_up_worker(tokenizer)
+    return ThreadPoolExecutor(
+        max_workers=workers,
+        thread_name_prefix=tokenizer,
+        initializer=_warm_up_worker,
+        initargs=(tokenizer,)
+    )
+
+
+def _clean_text(text: str) -> str:
+    """특수문자 제거"""
+    return re.sub(r"[^\w\s]", " ", text)
+
+
+def _batch_stats(n_reviews: int, n_nouns: int, started: float) -> dict:
+    return {
+        "worker":  f"{os.getpid()}/{threading.current_thread().name}",
+        "reviews": n_reviews,
+        "nouns":   n_nouns,
+        "seconds": time.perf_counter() - started
+    }
+
+
+def _tokenize_batch(texts: list[str], min_length: int, tokenizer: str = "okt") -> tuple[Counter, dict]:
+    """리뷰 배치 하나의 명사 빈도와 처리 통계"""
+    started = time.perf_counter()
+
+    batch_text = _clean_text(" ".join(texts))                   # 특수문자 제거
+    nouns = get_tokenizer(tokenizer).nouns(batch_text)          # 명사 추출
+    nouns = [n for n in nouns if len(n) >= min_length]          # 길이 필터
+
+    return Counter(nouns), _batch_stats(len(texts), len(nouns), started)
+
+
+def _tokenize_reviews(texts: list[str], tokenizer: str = "okt") -> tuple[list[list[str]], dict]:
+    """리뷰별 명사 목록(길이 필터 전)과 처리 통계 - 토큰 저장소 적재용"""
+    started = time.perf_counter()
+
+    backend = get_tokenizer(tokenizer)
+    tokens = [backend.nouns(_clean_text(text)) for text in texts]
+
+    return tokens, _batch_stats(len(texts), sum(map(len, tokens)), started)
+
+
+def _run_batches(
+    func,
+    batches: list,
+    *args,
+    pool: str = "thread",
+    workers: int = 1,
+    tokenizer: str = "okt"
+) -> list:
+    """배치들을 풀에서(또는 순차로) 실행하고 결과를 제출 순서대로 반환 (tokenizer 는 func 의 마지막 인자)"""
+    args = (*args, tokenizer)
+    if workers > 1 and len(batches) > 1:
+        executor = get_tokenizer_pool(pool, workers, tokenizer)
+        extra = [[arg] * len(batches) for arg in args]
+        try:
+            results = list(executor.map(func, batches, *extra))
+        except BrokenExecutor:
+            # 워커 초기화(또는 워커 프로세스)가 죽은 풀은 캐시에서 버리고 다음 호출에서 새로 만든다
+            get_tokenizer_pool.clear()
+            raise
+    else:
+        results = [func(batch, *args) for batch in batches]
+
+    _record_worker_stats([stats for _, stats in results])
+    return [value for value, _ in results]
+
+
+def _record_worker_stats(batch_stats: list[dict]):
+    """배치 통계를 워커별 처리량으로 묶어 보관"""
+    per_worker = {}
+    for b in batch_stats:
+        w = per_worker.setdefault(
+            b["worker"], {"worker": b["worker"], "batches": 0, "reviews": 0, "nouns": 0, "seconds": 0.0}
+        )
+        w["batches"] += 1
+        w["reviews"] += b["reviews"]
+        w["nouns"]   += b["nouns"]
+        w["seconds"] += b["seconds"]
+
+    for w in per_worker.values():
+        w["reviews_per_sec"] = w["reviews"] / w["seconds"] if w["seconds"] else 0.0
+
+    with _worker_stats_lock:
+        _last_worker_stats[:] = list(per_worker.values())
+
+
+def get_tokenizer_stats() -> pd.DataFrame:
+    """마지막 형태소 분석 실행의 워커별 처리량 (캐시 히트 시에는 이전 실행 값)"""
+    with _worker_stats_lock:
+        return pd.DataFrame(_last_worker_stats)
+
+
+@instrument()
+def tokenize_reviews(
+    texts: pd.Series,
+    review_uids: pd.Series,
+    *,
+    token_store_path: str,
+    batch_size: int = 1_000,
+    pool: str = "thread",
+    workers: int = 1,
+    tokenizer: str = "okt"
+) -> list[list[str]]:
+    """
+    리뷰별 명사 목록을 반환한다. 토큰 저장소에 (tokenizer, review_uid) 가 없는 리뷰만
+    형태소 분석하고 결과를 저장소에 적재한다.
+
+    Returns
+    -------
+    texts 와 같은 순서의 명사 목록 리스트 (길이 필터 전)
+    """
+    store = get_token_store(token_store_path)
+    store_key = tokenizer_store_key(tokenizer)
+    uids = review_uids.astype(str).tolist()
+    cached = store.get_many(list(dict.fromkeys(uids)), store_key)
+
+    missing = {}                                        # uid → text (중복 uid 는 한 번만)
+    for uid, text in zip(uids, texts.astype(str).tolist()):
+        if uid not in cached and uid not in missing:
+            missing[uid] = text
+
+    if missing:
+        missing_uids = list(missing)
+        missing_texts = list(missing.values())
+        batches = [
+            missing_texts[start:start + batch_size]
+            for start in range(0, len(missing_texts), batch_size)
+        ]
+        new_tokens = [
+            tokens
+            for batch_tokens in _run_batches(
+                _tokenize_reviews, batches, pool=pool, workers=workers, tokenizer=tokenizer
+            )
+            for tokens in batch_tokens
+        ]
+        fresh = dict(zip(missing_uids, new_tokens))
+        store.put_many(fresh, store_key)
+        cached.update(fresh)
+
+    return [cached[uid] for uid in uids]
+
+
+@instrument()
+@fingerprint_cache(shared=True, show_spinner=False)
 def extract_keywords_batch(
     text_series: pd.Series,
     *,
     top_n: int = 50,
     min_length: int = 2,
-    batch_size: int = 1_000
+    batch_size: int = 1_000,
+    pool: str = "thread",
+    workers: int = 1,
+    review_uids: pd.Series | None = None,
+    token_store_path: str | None = None,
+    sketch_capacity: int | None = None,
+    tokenizer: str = "okt"
 ) -> list[tuple[str, int]]:
     """
     대용량 한국어 리뷰에서 상위 N개 키워드(명사)와 빈도를 추출한다.
 
+    배치들은 get_tokenizer_pool 의 워커들에 나눠 형태소 분석하고,
+    배치별 Counter 를 제출 순서대로 합친다 (동률 키워드 순서를 결정적으로 유지).
+    review_uids 와 token_store_path 가 주어지면 리뷰별 토큰 저장소를 거쳐
+    처음 보는 리뷰만 형태소 분석한다.
+    sketch_capacity 가 주어지면 전체 어휘 Counter 대신 고정 메모리
+    HeavyHitters 스케치로 집계한다 (빈도는 추정 상한).
+
     Parameters
     ----------
-    text_series : 리뷰 텍스트 Series
-    top_n       : 반환할 키워드 개수
-    min_length  : 키워드 최소 글자 수
-    batch_size  : 형태소 분석 배치 크기
+    text_series      : 리뷰 텍스트 Series
+    top_n            : 반환할 키워드 개수
+    min_length       : 키워드 최소 글자 수
+    batch_size       : 형태소 분석 배치 크기
+    pool             : "thread" 또는 "process"
+    workers          : 병렬 워커 수 (1 이면 현재 스레드에서 순차 처리)
+    review_uids      : text_series 와 같은 순서의 review_uid Series
+    token_store_path : 토큰 저장소(SQLite) 경로
+    sketch_capacity  : 스케치가 유지할 후보 키워드 수 (None 이면 정확한 Counter)
+    tokenizer        : 형태소 분석기 백엔드 이름 (noun_tokenizers.TOKENIZER_BACKENDS)
 
     Returns
     -------
     List[Tuple[keyword, frequency]]
     """
-    okt = Okt()
-    total_counter = Counter()
+    counter = stream_keywords(
+        [text_series],
+        [review_uids] if review_uids is not None else None,
+        min_length=min_length,
+        batch_size=batch_size,
+        pool=pool,
+        workers=workers,
+        token_store_path=token_store_path,
+        sketch_capacity=sketch_capacity,
+        tokenizer=tokenizer
+    )
+    return counter.most_common(top_n)
+
+
+def stream_keywords(
+    text_chunks,
+    uid_chunks=None,
+    *,
+    min_length: int = 2,
+    batch_size: int = 1_000,
+    pool: str = "thread",
+    workers: int = 1,
+    token_store_path: str | None = None,
+    sketch_capacity: int | None = None,
+    counter=None,
+    tokenizer: str = "okt"
+):
+    """
+    리뷰 텍스트 덩어리(iterable of Series)를 순서대로 소비하며 명사 빈도를 누적한다.
+
+    입력 전체를 메모리에 올리지 않아도 되므로 BigQuery 배치 스트림 등에 바로 쓸 수 있다.
+    counter 가 주어지면 거기에 이어서 누적하고, 없으면 sketch_capacity 에 따라
+    HeavyHitters 스케치 또는 Counter 를 새로 만든다. 두 객체 모두 update(Counter) 로
+    누적하고 most_common(n) 으로 상위 키워드를 꺼낸다.
+    """
+    if counter is None:
+        if sketch_capacity:
+            from heavy_hitters import HeavyHitters
+
+            counter = HeavyHitters(capacity=sketch_capacity)
+        else:
+            counter = Counter()
+
+    uid_chunks = iter(uid_chunks) if uid_chunks is not None else None
+    for text_series in text_chunks:
+        review_uids = next(uid_chunks) if uid_chunks is not None else None
+
+        if review_uids is not None and token_store_path:
+            nouns_list = tokenize_reviews(
+                text_series,
+                review_uids,
+                token_store_path=token_store_path,
+                batch_size=batch_size,
+                pool=pool,
+                workers=workers,
+                tokenizer=tokenizer
+            )
+            for start in range(0, len(nouns_list), batch_size):
+                counter.update(Counter(
+                    n for nouns in nouns_list[start:start + batch_size] for n in nouns if len(n) >= min_length
+                ))
+            continue
+
+        batches = [
+            text_series.iloc[start:start + batch_size].astype(str).tolist()
+            for start in range(0, len(text_series), batch_size)
+        ]
+        for batch_counter in _run_batches(
+            _tokenize_batch, batches, min_length, pool=pool, workers=workers, tokenizer=tokenizer
+        ):
+            counter.update(batch_counter)
+
+    return counter
+
+
+class KeywordMatcher:
+    """
+    여러 키워드를 리뷰 1건당 한 번의 정규식 스캔으로 찾는 매처.
+
+    키워드를 길이 내림차순으로 정렬한 lookahead 교대(alternation) 패턴을 쓰면
+    각 위치에서 가장 긴 키워드 하나만 매칭된다. 같은 위치에서 시작하는 더 짧은
+    키워드는 반드시 그 긴 키워드의 부분 문자열이므로, 키워드별 "부분 문자열
+    키워드 집합"을 미리 계산해 두면 겹치는 키워드까지 정확히 복원할 수 있다.
+    (키워드마다 str.contains 를 도는 것과 동일한 결과)
+    """
+
+    def __init__(self, keywords: list[str]):
+        self.keywords = list(dict.fromkeys(keywords))          # 순서 유지 중복 제거
+        self.index = {kw: i for i, kw in enumerate(self.keywords)}
+
+        ordered = sorted(self.keywords, key=len, reverse=True)
+        alternation = "|".join(re.escape(kw) for kw in ordered)
+        self.pattern = re.compile(f"(?=({alternation}))") if ordered else None
+
+        # 키워드 → 자신에 포함된 모든 키워드 인덱스
+        self.contained = {
+            kw: tuple(self.index[other] for other in self.keywords if other in kw)
+            for kw in self.keywords
+        }
+
+    def find(self, text: str) -> set[int]:
+        """텍스트 하나에 포함된 키워드 인덱스 집합"""
+        if self.pattern is None or not isinstance(text, str):
+            return set()
+        found = set()
+        for matched in set(self.pattern.findall(text)):
+            found.update(self.contained[matched])
+        return found
 
-    for start in range(0, len(text_series), batch_size):
-        batch_text = " ".join(text_series.iloc[start:start + batch_size].astype(str))
-        batch_text = re.sub(r"[^\w\s]", " ", batch_text)          # 특수문자 제거
-        nouns = okt.nouns(batch_text)                             # 명사 추출
-        nouns = [n for n in nouns if len(n) >= min_length]        # 길이 필터
-        total_counter.update(nouns)
 
-    return total_counter.most_common(top_n)
+def build_keyword_matcher(keywords: list[tuple[str, int]] | list[str]) -> KeywordMatcher:
+    """extract_keywords_batch 결과(또는 키워드 리스트)로 매처 생성"""
+    return KeywordMatcher([k[0] if isinstance(k, tuple) else k for k in keywords])
 
 
-@st.cache_data(show_spinner=False)
+def match_keywords(texts, matcher: KeywordMatcher) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (리뷰, 키워드) 히트 리스트를 만든다.
+
+    Returns
+    -------
+    (review_idx, keyword_idx) : 같은 길이의 int 배열 쌍
+        review_idx 는 texts 내 위치(0-based), keyword_idx 는 matcher.keywords 인덱스
+    """
+    review_idx, keyword_idx = [], []
+    for pos, text in enumerate(texts):
+        for k in matcher.find(text):
+            review_idx.append(pos)
+            keyword_idx.append(k)
+
+    return (
+        np.asarray(review_idx, dtype=np.int64),
+        np.asarray(keyword_idx, dtype=np.int64)
+    )
+
+
+@instrument()
+@fingerprint_cache(shared=True, show_spinner=False)
 def calculate_keyword_sentiment_streaming(
     df: pd.DataFrame,
     keywords: list[tuple[str, int]],
@@ -56,6 +394,9 @@ def calculate_keyword_sentiment_streaming(
     """
     키워드별 리뷰 수·긍정률·평균 별점을 스트리밍(청크) 방식으로 계산한다.
 
+    청크마다 리뷰 1건당 한 번만 텍스트를 스캔해 (리뷰, 키워드) 히트를 만들고,
+    np.bincount 로 키워드별 리뷰 수·긍정 수·별점 합을 한 번에 누적한다.
+
     Parameters
     ----------
     df        : 리뷰 원본 DataFrame (content, star, pred_label 컬럼 포함)
@@ -68,43 +409,38 @@ def calculate_keyword_sentiment_streaming(
         keyword, frequency, review_count, positive_rate, avg_rating
     ]
     """
-    # 결과 누적용 dict
-    stats = {
-        k: {
-            "keyword": k,
-            "frequency": f,
-            "review_count": 0,
-            "positive_cnt": 0,
-            "rating_sum": 0.0
-        }
-        for k, f in keywords
-    }
+    matcher = build_keyword_matcher(keywords)
+    frequency = dict(keywords)
+    n_kw = len(matcher.keywords)
+
+    # 결과 누적용 배열
+    review_count = np.zeros(n_kw, dtype=np.int64)
+    positive_cnt = np.zeros(n_kw, dtype=np.int64)
+    rating_sum = np.zeros(n_kw, dtype=np.float64)
 
     for start in range(0, len(df), chunk_size):
         chunk = df.iloc[start:start + chunk_size]
 
-        for kw in stats.keys():
-            mask = chunk["content"].str.contains(kw, na=False)
-            sub = chunk[mask]
-            cnt = len(sub)
-            if cnt == 0:
-                continue
-
-            stats[kw]["review_count"] += cnt
-            stats[kw]["positive_cnt"] += (sub["pred_label"] == "positive").sum()
-            stats[kw]["rating_sum"]   += sub["star"].sum()
-
-    # 최종 DataFrame 변환
-    rows = []
-    for v in stats.values():
-        if v["review_count"] == 0:      # 리뷰가 실제로 없으면 제외
+        review_idx, keyword_idx = match_keywords(chunk["content"], matcher)
+        if len(review_idx) == 0:
             continue
-        rows.append({
-            "keyword":       v["keyword"],
-            "frequency":     v["frequency"],
-            "review_count":  v["review_count"],
-            "positive_rate": v["positive_cnt"] / v["review_count"] * 100,
-            "avg_rating":    v["rating_sum"] / v["review_count"]
-        })
-
-    return pd.DataFrame(rows)
+
+        is_positive = (chunk["pred_label"] == "positive").to_numpy(dtype=np.float64)
+        stars = chunk["star"].to_numpy(dtype=np.float64)
+
+        review_count += np.bincount(keyword_idx, minlength=n_kw)
+        positive_cnt += np.bincount(
+            keyword_idx, weights=is_positive[review_idx], minlength=n_kw
+        ).astype(np.int64)
+        rating_sum += np.bincount(keyword_idx, weights=stars[review_idx], minlength=n_kw)
+
+    # 최종 DataFrame 변환 (리뷰가 실제로 없는 키워드는 제외)
+    has_reviews = review_count > 0
+    counts = review_count[has_reviews]
+    return pd.DataFrame({
+        "keyword":       [kw for kw, ok in zip(matcher.keywords, has_reviews) if ok],
+        "frequency":     [frequency[kw] for kw, ok in zip(matcher.keywords, has_reviews) if ok],
+        "review_count":  counts,
+        "positive_rate": positive_cnt[has_reviews] / counts * 100,
+        "avg_rating":    rating_sum[has_reviews] / counts
+    }, columns=["keyword", "frequency", "review_count", "positive_rate", "avg_rating"])
@@ -0,0 +1,213 @@
+"""
+키워드 × 플랫폼 × 카테고리 × 일자 사전 집계(큐브)
+1) 큐브 행 생성  ─ build_keyword_cube (기존 매처·토큰 저장소 재사용)
+2) 큐브 롤업      ─ rollup_keyword_cube (키워드 페이지의 keyword_df 형태로 변환)
+3) 배치 작업      ─ materialize_keyword_cube / python keyword_cube.py
+
+배치 작업은 predicted_reviews 전체를 한 번만 읽어 로컬 Parquet 으로 내려두고,
+1차로 토큰 저장소를 채우며 상위 키워드를 고른 뒤 2차로 큐브를 만든다.
+"""
+import os
+import argparse
+import tempfile
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from keyword_analyzer import build_keyword_matcher, match_keywords, tokenize_reviews, stream_keywords
+from keyword_trends import to_utc_days
+
+
+CUBE_KEYS = ["keyword", "platform", "category", "day"]
+CUBE_COLUMNS = CUBE_KEYS + ["frequency", "review_count", "positive_count", "negative_count", "star_sum"]
+
+SOURCE_COLUMNS = ["review_uid", "content", "star", "pred_label", "category", "platform", "created_at"]
+
+
+def build_keyword_cube(df: pd.DataFrame, keywords, tokens: list[list[str]] | None = None) -> pd.DataFrame:
+    """
+    리뷰 DataFrame 한 덩어리의 큐브 행.
+
+    review_count·positive_count·negative_count·star_sum 은 calculate_keyword_sentiment_streaming 과 같은
+    부분 문자열 매칭 기준이고, frequency 는 리뷰별 명사 토큰(tokens)에서 센 출현 횟수다.
+    """
+    matcher = build_keyword_matcher(keywords)
+    if df.empty or not matcher.keywords:
+        return pd.DataFrame(columns=CUBE_COLUMNS)
+
+    keyword_names = np.asarray(matcher.keywords, dtype=object)
+    platform = df["platform"].astype(str).to_numpy()
+    category = df["category"].astype(str).to_numpy()
+    # 라이브 추이와 같은 UTC 날짜 버킷
+    day = pd.to_datetime(to_utc_days(df["created_at"])).date
+
+    review_idx, keyword_idx = match_keywords(df["content"], matcher)
+    hits = pd.DataFrame({
+        "keyword": keyword_names[keyword_idx],
+        "platform": platform[review_idx],
+        "category": category[review_idx],
+        "day": day[review_idx],
+        "review_count": 1,
+        "positive_count": (df["pred_label"] == "positive").to_numpy(dtype=np.int64)[review_idx],
+        "negative_count": (df["pred_label"] == "negative").to_numpy(dtype=np.int64)[review_idx],
+        "star_sum": df["star"].to_numpy(dtype=np.int64)[review_idx],
+    }).groupby(CUBE_KEYS, sort=False).sum()
+
+    if tokens is not None:
+        pos, kw, count = [], [], []
+        for p, nouns in enumerate(tokens):
+            for noun, c in Counter(nouns).items():
+                k = matcher.index.get(noun)
+                if k is not None:
+                    pos.append(p)
+                    kw.append(k)
+                    count.append(c)
+        pos = np.asarray(pos, dtype=np.int64)
+        kw = np.asarray(kw, dtype=np.int64)
+
+        frequency = pd.DataFrame({
+            "keyword": keyword_names[kw],
+            "platform": platform[pos],
+            "category": category[pos],
+            "day": day[pos],
+            "frequency": np.asarray(count, dtype=np.int64),
+        }).groupby(CUBE_KEYS, sort=False).sum()
+        hits = hits.join(frequency, how="outer")
+
+    cube = hits.fillna(0).reset_index()
+    if "frequency" not in cube.columns:
+        cube["frequency"] = 0
+    return cube[CUBE_COLUMNS].astype({
+        "frequency": "int64", "review_count": "int64", "positive_count": "int64",
+        "negative_count": "int64", "star_sum": "int64"
+    })
+
+
+def merge_cubes(cubes: list[pd.DataFrame]) -> pd.DataFrame:
+    """여러 큐브 조각을 같은 키끼리 더한다"""
+    if not cubes:
+        return pd.DataFrame(columns=CUBE_COLUMNS)
+    return pd.concat(cubes, ignore_index=True).groupby(CUBE_KEYS, as_index=False, sort=False).sum()
+
+
+def rollup_keyword_cube(cube: pd.DataFrame) -> pd.DataFrame:
+    """
+    큐브(또는 키워드별로 이미 롤업된 결과)를 키워드 단위로 합쳐
+    calculate_keyword_sentiment_streaming 과 같은 컬럼으로 변환한다.
+    """
+    totals = cube.groupby("keyword", as_index=False, sort=False)[
+        ["frequency", "review_count", "positive_count", "star_sum"]
+    ].sum()
+    totals = totals[totals["review_count"] > 0]
+
+    return pd.DataFrame({
+        "keyword": totals["keyword"],
+        "frequency": totals["frequency"],
+        "review_count": totals["review_count"],
+        "positive_rate": totals["positive_count"] / totals["review_count"] * 100,
+        "avg_rating": totals["star_sum"] / totals["review_count"]
+    }).sort_values("frequency", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def _iter_spilled(path: str, batch_rows: int):
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows):
+        yield batch.to_pandas()
+
+
+def materialize_keyword_cube(
+    backend,
+    *,
+    token_store_path: str,
+    top_n: int = 500,
+    min_length: int = 2,
+    batch_rows: int = 50_000,
+    pool: str = "thread",
+    workers: int = 1,
+    sketch_capacity: int | None = None,
+    tokenizer: str = "okt"
+) -> pd.DataFrame:
+    """
+    predicted_reviews 전체로 키워드 큐브를 만들어 백엔드의 keyword_cube 테이블에 저장.
+    sketch_capacity 가 주어지면 상위 키워드 선정을 고정 메모리 HeavyHitters 스케치로 한다.
+    """
+    query = f"""
+    SELECT {", ".join(SOURCE_COLUMNS)}
+    FROM {backend.table("predicted_review")}
+    WHERE content IS NOT NULL and star > 0
+    """
+
+    with tempfile.TemporaryDirectory() as tmp:
+        spill_path = os.path.join(tmp, "predicted_review.parquet")
+
+        # 1차: 전체 테이블을 한 번 읽으며 로컬에 내려두고, 토큰 저장소를 채워 상위 키워드 선정
+        noun_counter = None
+        writer = None
+        for batch in backend.query_batches(query, label="materialize_keyword_cube"):
+            table = pa.Table.from_batches([batch])
+            if writer is None:
+                writer = pq.ParquetWriter(spill_path, table.schema)
+            writer.write_table(table)
+
+            chunk = table.to_pandas()
+            noun_counter = stream_keywords(
+                [chunk["content"]], [chunk["review_uid"]],
+                min_length=min_length, pool=pool, workers=workers,
+                token_store_path=token_store_path, sketch_capacity=sketch_capacity,
+                counter=noun_counter, tokenizer=tokenizer
+            )
+        if writer is None:
+            return pd.DataFrame(columns=CUBE_COLUMNS)
+        writer.close()
+
+        keywords = noun_counter.most_common(top_n)
+        print(f"keywords: {len(keywords):,} (candidates {len(noun_counter):,})")
+        if sketch_capacity:
+            print(f"sketch error bounds: {noun_counter.error_bounds()}")
+
+        # 2차: 저장된 토큰(캐시 히트)과 매처로 큐브 조각을 만들어 합친다
+        cubes, processed = [], 0
+        for chunk in _iter_spilled(spill_path, batch_rows):
+            tokens = tokenize_reviews(
+                chunk["content"], chunk["review_uid"],
+                token_store_path=token_store_path, pool=pool, workers=workers, tokenizer=tokenizer
+            )
+            cubes.append(build_keyword_cube(chunk, keywords, tokens))
+            processed += len(chunk)
+            print(f"processed {processed:,} reviews")
+
+    cube = merge_cubes(cubes)
+    backend.write_table("keyword_cube", cube)
+    return cube
+
+
+if __name__ == "__main__":
+    from config import (
+        get_data_backend, token_store_path, tokenizer_pool, tokenizer_workers, tokenizer_backend,
+        batch_max_bytes_per_query
+    )
+
+    parser = argparse.ArgumentParser(description="키워드 큐브 사전 집계 배치 작업")
+    parser.add_argument("--top-n", type=int, default=500)
+    parser.add_argument("--min-length", type=int, default=2)
+    parser.add_argument("--batch-rows", type=int, default=50_000)
+    parser.add_argument("--sketch-capacity", type=int, default=None,
+                        help="상위 키워드 선정에 쓸 HeavyHitters 후보 수 (생략 시 정확한 Counter)")
+    parser.add_argument("--max-bytes", type=int, default=batch_max_bytes_per_query,
+                        help="쿼리당 스캔 바이트 예산 (0 이면 제한 없음, 기본값 BATCH_MAX_BYTES_PER_QUERY)")
+    args = parser.parse_args()
+
+    result = materialize_keyword_cube(
+        get_data_backend().with_budget(args.max_bytes),
+        token_store_path=token_store_path,
+        top_n=args.top_n,
+        min_length=args.min_length,
+        batch_rows=args.batch_rows,
+        pool=tokenizer_pool,
+        workers=tokenizer_workers,
+        sketch_capacity=args.sketch_capacity,
+        tokenizer=tokenizer_backend
+    )
+    print(f"keyword_cube: {len(result):,} rows")
@@ -0,0 +1,111 @@
+"""
+리뷰 × 키워드 희소 행렬(CSR)과 키워드 동시 출현 분석
+필터된 데이터셋마다 한 번, 다중 키워드 매처의 히트로 X[리뷰, 키워드] = 1 인 행렬을 만들고
+키워드 쌍의 동시 출현 수·lift·PMI·조건부 긍정률은 X.T @ X 같은 희소 행렬 곱으로 구한다.
+키워드를 몇 개 고르든 본문을 다시 스캔하지 않는다.
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from cache_keys import fingerprint_cache
+from keyword_analyzer import build_keyword_matcher, match_keywords
+
+
+class KeywordMatrix:
+    """리뷰 × 키워드 0/1 CSR 행렬과 리뷰별 감성·별점·작성일"""
+
+    def __init__(self, df: pd.DataFrame, keywords):
+        matcher = build_keyword_matcher(keywords)
+        self.keywords = matcher.keywords
+        self.n_reviews = len(df)
+
+        review_idx, keyword_idx = match_keywords(df["content"], matcher)
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(review_idx), dtype=np.int32), (review_idx, keyword_idx)),
+            shape=(self.n_reviews, len(self.keywords))
+        )
+        self.positive = (df["pred_label"] == "positive").to_numpy(dtype=np.int32)
+        self.star = df["star"].to_numpy(dtype=np.float64)
+        created_at = pd.to_datetime(df["created_at"])
+        if created_at.dt.tz is not None:
+            created_at = created_at.dt.tz_localize(None)
+        self.created_at = created_at.to_numpy()
+
+    def _columns(self, keywords) -> list[int]:
+        index = {k: i for i, k in enumerate(self.keywords)}
+        return [index[k] for k in keywords if k in index] if keywords is not None \
+            else list(range(len(self.keywords)))
+
+    def keyword_stats(self, keywords=None, recent_since=None) -> pd.DataFrame:
+        """키워드별 리뷰 수·긍정률·평균 별점(·recent_since 이후 리뷰 수)"""
+        cols = self._columns(keywords)
+        X = self.matrix[:, cols]
+        review_count = np.asarray(X.sum(axis=0)).ravel()
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            stats = pd.DataFrame({
+                "keyword": [self.keywords[c] for c in cols],
+                "review_count": review_count,
+                "positive_rate": X.T @ self.positive / review_count * 100,
+                "avg_rating": X.T @ self.star / review_count
+            })
+        if recent_since is not None:
+            recent = (self.created_at >= pd.Timestamp(recent_since).to_datetime64()).astype(np.int32)
+            stats["recent_reviews"] = X.T @ recent
+        return stats
+
+    def cooccurrence(self, keywords=None) -> pd.DataFrame:
+        """키워드 쌍별 동시 출현 리뷰 수 (대각선 = 키워드별 리뷰 수)"""
+        cols = self._columns(keywords)
+        X = self.matrix[:, cols]
+        names = [self.keywords[c] for c in cols]
+        return pd.DataFrame((X.T @ X).toarray(), index=names, columns=names)
+
+    def lift(self, keywords=None) -> pd.DataFrame:
+        """lift(a, b) = P(a, b) / (P(a) P(b)) - 1 보다 크면 우연보다 자주 함께 등장"""
+        counts = self.cooccurrence(keywords)
+        single = np.diag(counts.to_numpy()).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return counts * self.n_reviews / np.outer(single, single)
+
+    def pmi(self, keywords=None) -> pd.DataFrame:
+        """점별 상호정보량 log2(lift) - 함께 등장하지 않은 쌍은 -inf"""
+        with np.errstate(divide="ignore"):
+            return np.log2(self.lift(keywords))
+
+    def conditional_positive_rate(self, keywords=None) -> pd.DataFrame:
+        """두 키워드가 함께 등장한 리뷰의 긍정률 (%) - (a, a) 는 a 단독 긍정률"""
+        cols = self._columns(keywords)
+        X = self.matrix[:, cols]
+        names = [self.keywords[c] for c in cols]
+        both = (X.T @ X).toarray()
+        positive_both = (X.T @ sparse.diags(self.positive) @ X).toarray()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return pd.DataFrame(positive_both / both * 100, index=names, columns=names)
+
+    def pairs(self, keywords=None, min_count: int = 1) -> pd.DataFrame:
+        """키워드 쌍(a < b) 목록 - 동시 출현 수·lift·PMI·긍정률, 동시 출현 수 내림차순"""
+        counts = self.cooccurrence(keywords)
+        lift = self.lift(keywords).to_numpy()
+        positive_rate = self.conditional_positive_rate(keywords).to_numpy()
+        a, b = np.triu_indices(len(counts), k=1)
+        values = counts.to_numpy()[a, b]
+        keep = values >= min_count
+
+        names = np.asarray(counts.index, dtype=object)
+        with np.errstate(divide="ignore"):
+            return pd.DataFrame({
+                "keyword_a": names[a[keep]],
+                "keyword_b": names[b[keep]],
+                "review_count": values[keep],
+                "lift": lift[a[keep], b[keep]],
+                "pmi": np.log2(lift[a[keep], b[keep]]),
+                "positive_rate": positive_rate[a[keep], b[keep]]
+            }).sort_values("review_count", ascending=False, kind="stable").reset_index(drop=True)
+
+
+@fingerprint_cache(show_spinner=False)
+def build_keyword_matrix(df: pd.DataFrame, keywords: list[str]) -> KeywordMatrix:
+    """필터된 리뷰 데이터셋(지문 기준)마다 한 번만 만드는 리뷰 × 키워드 행렬"""
+    return KeywordMatrix(df, keywords)
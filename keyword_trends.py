@@ -0,0 +1,190 @@
+"""
+키워드 시계열 트렌드 엔진
+일자별 (키워드 → 리뷰 수, 긍정 수, 부정 수, 별점 합) 카운터를 한 번 만들어 두고
+최근 7일·30일, 주간 비교 같은 임의의 기간은 텍스트를 다시 스캔하지 않고
+누적합(prefix sum)으로 버킷을 더해 계산한다.
+"""
+import numpy as np
+import pandas as pd
+
+from cache_keys import fingerprint_cache
+from keyword_analyzer import build_keyword_matcher, match_keywords
+
+
+# counts 마지막 축의 의미
+REVIEW, POSITIVE, STAR, NEGATIVE = 0, 1, 2, 3
+N_AXES = 4
+
+
+def to_utc_days(values: pd.Series) -> np.ndarray:
+    """
+    날짜/시각 컬럼 → datetime64[D] (UTC 기준 날짜).
+
+    시간대가 있으면 UTC 로 바꾼 뒤 날짜를 자르고, 시간대가 없으면 UTC 로 간주한다.
+    기간 필터(date_range_predicates)의 경계도 UTC 자정이므로
+    라이브 모드와 큐브 모드(keyword_cube 의 day)가 같은 날짜 정의를 쓴다.
+    """
+    values = pd.to_datetime(values)
+    if values.dt.tz is not None:
+        values = values.dt.tz_convert("UTC").dt.tz_localize(None)
+    return values.to_numpy().astype("datetime64[D]")
+
+
+class KeywordTrendCounters:
+    """일자 × 키워드 × (리뷰 수, 긍정 수, 별점 합, 부정 수) 카운터 - 같은 구조끼리 더해서 병합 가능"""
+
+    def __init__(self, keywords: list[str], days: np.ndarray, counts: np.ndarray):
+        self.keywords = list(keywords)
+        self.days = np.asarray(days, dtype="datetime64[D]")
+        self.counts = np.asarray(counts, dtype=np.int64)            # (n_days, n_keywords, N_AXES)
+        # 0 번째 행은 0 인 누적합 - 구간 [i, j) 합 = prefix[j] - prefix[i]
+        self._prefix = np.concatenate(
+            [np.zeros((1,) + self.counts.shape[1:], dtype=np.int64), self.counts.cumsum(axis=0)]
+        )
+
+    @classmethod
+    def from_reviews(cls, df: pd.DataFrame, keywords) -> "KeywordTrendCounters":
+        """리뷰 DataFrame 에서 일자별 카운터 생성 (리뷰당 텍스트 스캔 1회)"""
+        matcher = build_keyword_matcher(keywords)
+        day = to_utc_days(df["created_at"])
+        days, day_idx = np.unique(day[~np.isnat(day)], return_inverse=True)
+        row_day = np.full(len(day), -1, dtype=np.int64)
+        row_day[~np.isnat(day)] = day_idx
+
+        review_idx, keyword_idx = match_keywords(df["content"], matcher)
+        # 작성일이 없는 리뷰는 어느 버킷에도 넣지 않는다
+        dated = row_day[review_idx] >= 0
+        review_idx, keyword_idx = review_idx[dated], keyword_idx[dated]
+        counts = np.zeros((len(days), len(matcher.keywords), N_AXES), dtype=np.int64)
+        rows, cols = row_day[review_idx], keyword_idx
+        np.add.at(counts[:, :, REVIEW], (rows, cols), 1)
+        np.add.at(counts[:, :, POSITIVE], (rows, cols),
+                  (df["pred_label"] == "positive").to_numpy(dtype=np.int64)[review_idx])
+        np.add.at(counts[:, :, STAR], (rows, cols), df["star"].to_numpy(dtype=np.int64)[review_idx])
+        np.add.at(counts[:, :, NEGATIVE], (rows, cols),
+                  (df["pred_label"] == "negative").to_numpy(dtype=np.int64)[review_idx])
+
+        return cls(matcher.keywords, days, counts)
+
+    @classmethod
+    def from_cube(cls, cube: pd.DataFrame) -> "KeywordTrendCounters":
+        """keyword_cube 행(keyword, day, review_count, positive_count, negative_count, star_sum)에서 생성"""
+        keywords = list(dict.fromkeys(cube["keyword"]))
+        days, day_idx = np.unique(to_utc_days(cube["day"]), return_inverse=True)
+        keyword_idx = pd.Index(keywords).get_indexer(cube["keyword"])
+
+        counts = np.zeros((len(days), len(keywords), N_AXES), dtype=np.int64)
+        axes = ((REVIEW, "review_count"), (POSITIVE, "positive_count"), (STAR, "star_sum"), (NEGATIVE, "negative_count"))
+        for axis, column in axes:
+            np.add.at(counts[:, :, axis], (day_idx, keyword_idx), cube[column].to_numpy(dtype=np.int64))
+
+        return cls(keywords, days, counts)
+
+    def merge(self, other: "KeywordTrendCounters") -> "KeywordTrendCounters":
+        """두 카운터의 일자·키워드 합집합으로 더한 새 카운터"""
+        keywords = list(dict.fromkeys(self.keywords + other.keywords))
+        days = np.union1d(self.days, other.days)
+        counts = np.zeros((len(days), len(keywords), N_AXES), dtype=np.int64)
+
+        for part in (self, other):
+            rows = np.searchsorted(days, part.days)
+            cols = pd.Index(keywords).get_indexer(part.keywords)
+            counts[np.ix_(rows, cols)] += part.counts
+
+        return KeywordTrendCounters(keywords, days, counts)
+
+    @property
+    def last_day(self) -> np.datetime64:
+        return self.days.max()
+
+    def window_counts(self, start, end) -> np.ndarray:
+        """[start, end] 기간(일자 포함)의 (키워드, N_AXES) 합계"""
+        i = np.searchsorted(self.days, np.datetime64(start, "D"), side="left")
+        j = np.searchsorted(self.days, np.datetime64(end, "D"), side="right")
+        return self._prefix[j] - self._prefix[i]
+
+    def window(self, start, end) -> pd.DataFrame:
+        """기간 내 키워드별 리뷰 수·긍정률·평균 별점"""
+        totals = self.window_counts(start, end)
+        review_count = totals[:, REVIEW]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return pd.DataFrame({
+                "keyword": self.keywords,
+                "review_count": review_count,
+                "positive_rate": totals[:, POSITIVE] / review_count * 100,
+                "avg_rating": totals[:, STAR] / review_count
+            })
+
+    def last_days(self, n_days: int, end=None) -> pd.DataFrame:
+        """end(기본: 데이터의 마지막 날)까지 최근 n_days 일"""
+        end = np.datetime64(end, "D") if end is not None else self.last_day
+        return self.window(end - np.timedelta64(n_days - 1, "D"), end)
+
+    def period_over_period(self, n_days: int = 7, end=None) -> pd.DataFrame:
+        """
+        최근 n_days 일과 그 직전 n_days 일 비교 (주간 비교 = 7).
+
+        직전 기간이 데이터의 첫날까지 내려가면(행 수 제한으로 로드한 데이터 등) 그 기간은
+        일부만 들어 있어 모든 키워드가 늘어난 것처럼 보이므로, 증감 컬럼을 NaN 으로 비우고
+        attrs['previous_complete'] = False 로 표시한다.
+        """
+        end = np.datetime64(end, "D") if end is not None else self.last_day
+        previous_start = end - np.timedelta64(2 * n_days - 1, "D")
+        current = self.window_counts(end - np.timedelta64(n_days - 1, "D"), end)
+        previous = self.window_counts(previous_start, end - np.timedelta64(n_days, "D"))
+        # 첫날 자체도 일부만 로드됐을 수 있으므로 첫날보다 뒤에서 시작해야 온전한 기간
+        previous_complete = bool(len(self.days)) and previous_start > self.days.min()
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            comparison = pd.DataFrame({
+                "keyword": self.keywords,
+                "review_count": current[:, REVIEW],
+                "previous_review_count": previous[:, REVIEW],
+                "review_count_change": current[:, REVIEW] - previous[:, REVIEW],
+                "negative_count": current[:, NEGATIVE],
+                "negative_count_change": current[:, NEGATIVE] - previous[:, NEGATIVE],
+                "positive_rate": current[:, POSITIVE] / current[:, REVIEW] * 100,
+                "positive_rate_change": current[:, POSITIVE] / current[:, REVIEW] * 100
+                                        - previous[:, POSITIVE] / previous[:, REVIEW] * 100
+            })
+        if not previous_complete:
+            comparison[["previous_review_count", "review_count_change",
+                        "negative_count_change", "positive_rate_change"]] = np.nan
+        comparison.attrs["previous_complete"] = previous_complete
+        return comparison
+
+    def daily(self, keywords=None, rolling_days: int = 1) -> pd.DataFrame:
+        """차트용 일자 × 키워드 롱 포맷 (rolling_days > 1 이면 이동 합계 기준)"""
+        cols = range(len(self.keywords)) if keywords is None else \
+            [self.keywords.index(k) for k in keywords if k in self.keywords]
+        if len(self.days) == 0:
+            return pd.DataFrame(columns=["day", "keyword", "review_count", "positive_rate"])
+
+        # 빈 날짜도 0 으로 채워 연속된 일자 축을 만든다
+        all_days = np.arange(self.days.min(), self.days.max() + np.timedelta64(1, "D"))
+        dense = np.zeros((len(all_days), len(self.keywords), N_AXES), dtype=np.int64)
+        dense[np.searchsorted(all_days, self.days)] = self.counts
+        if rolling_days > 1:
+            prefix = np.concatenate([np.zeros_like(dense[:1]), dense.cumsum(axis=0)])
+            start = np.maximum(np.arange(len(all_days)) + 1 - rolling_days, 0)
+            dense = prefix[np.arange(len(all_days)) + 1] - prefix[start]
+
+        frames = []
+        for c in cols:
+            review_count = dense[:, c, REVIEW]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                positive_rate = dense[:, c, POSITIVE] / review_count * 100
+            frames.append(pd.DataFrame({
+                "day": all_days.astype("datetime64[ns]"),
+                "keyword": self.keywords[c],
+                "review_count": review_count,
+                "positive_rate": positive_rate
+            }))
+        return pd.concat(frames, ignore_index=True) if frames else \
+            pd.DataFrame(columns=["day", "keyword", "review_count", "positive_rate"])
+
+
+@fingerprint_cache(show_spinner=False)
+def build_trend_counters(df: pd.DataFrame, keywords: list[str]) -> KeywordTrendCounters:
+    """필터된 리뷰 데이터셋(지문 기준)마다 한 번만 만드는 트렌드 카운터"""
+    return KeywordTrendCounters.from_reviews(df, keywords)
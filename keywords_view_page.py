@@ -1,87 +1,228 @@
 import streamlit as st
 import pandas as pd
+from functools import partial
 
-from data_processor import load_predicted_reviews
-from keyword_analyzer import extract_keywords_batch, calculate_keyword_sentiment_streaming
+from config import tokenizer_pool, tokenizer_workers, tokenizer_backend, token_store_path, \
+    keyword_sketch_capacity
+from data_processor import run_concurrently, load_predicted_reviews, load_keyword_cube, load_keyword_cube_daily, \
+    estimate_scan_bytes, load_keyword_cube_dimensions, load_review_totals
+from filter_index import get_filter_index
+from search_index import get_search_index
+from cache_keys import frame_fingerprint, tag_frame
+from instrumentation import stage
+from keyword_analyzer import extract_keywords_batch, calculate_keyword_sentiment_streaming, \
+    get_tokenizer_stats
+from keyword_cube import rollup_keyword_cube
+from keyword_trends import KeywordTrendCounters, build_trend_counters
+from keyword_matrix import build_keyword_matrix
 from chart_generator import create_bubble_chart, create_top_keywords_chart, \
-    create_sentiment_distribution_chart, create_correlation_matrix
+    create_sentiment_distribution_chart, create_correlation_matrix, create_keyword_trend_chart
 from ui_components import create_keyword_filter_section, display_keyword_reviews, \
-    render_review_cards, create_keyword_comparison_section, add_search_functionality
+    render_review_list, create_keyword_comparison_section, add_search_functionality
 
 
-def keyword_analysis_page(client):
-    # ----------------------- 리뷰 데이터 로드 -----------------------
+def keyword_analysis_page(backend, start_date=None, end_date=None):
     # ------------------- 페이지·사이드바 설정 -------------------
-    data_limit = st.sidebar.selectbox("데이터 개수", [1_000, 3_000, 5_000, 1_0000], index=1)
-    with st.spinner("데이터를 로드하는 중..."):
-        df = load_predicted_reviews(
-            _client=client,
-            limit=data_limit
-        )  # BigQuery → DataFrame
-
+    analysis_mode = st.sidebar.radio(
+        "분석 모드",
+        ["실시간 분석", "사전 집계 (전체 데이터)"],
+        help="사전 집계는 keyword_cube 배치 작업 결과를 사용합니다."
+    )
+    live = analysis_mode == "실시간 분석"
+    data_limit = st.sidebar.selectbox(
+        "데이터 개수" if live else "샘플 리뷰 개수", [1_000, 3_000, 5_000, 1_0000], index=1
+    )
 
-    st.success(f"총 {len(df):,}개의 리뷰 데이터를 로드했습니다.")
+    # --------------- 리뷰 로드 + 플랫폼·카테고리 필터 ---------------
+    if live:
+        df = load_review_sample(backend, data_limit, start_date, end_date)
+        # 데이터셋마다 한 번 만든 비트맵 인덱스로 선택 조합 → 행 번호
+        filter_index = get_filter_index(df, frame_fingerprint(df))
+        platform_options = filter_index.values("platform")
+        category_options = filter_index.values("category")
+    else:
+        # 사전 집계 모드는 원본 리뷰를 내려받지 않고 큐브에 있는 값으로 필터를 만든다
+        dimensions = load_keyword_cube_dimensions(_backend=backend, start_date=start_date, end_date=end_date)
+        platform_options = sorted(dimensions["platform"].unique())
+        category_options = sorted(dimensions["category"].unique())
 
-    # --------------- 플랫폼·카테고리 필터 ----------------------
     st.sidebar.subheader("🔧 필터 옵션")
-    platforms = st.sidebar.multiselect(
-        "플랫폼 선택",
-        options=df["platform"].unique(),
-        default=df["platform"].unique()
-    )
-    categories = st.sidebar.multiselect(
-        "카테고리 선택",
-        options=df["category"].unique(),
-        default=df["category"].unique()
-    )
-    filtered_df = df[(df["platform"].isin(platforms)) & (df["category"].isin(categories))]
-    if filtered_df.empty:
+    platforms = st.sidebar.multiselect("플랫폼 선택", options=platform_options, default=platform_options)
+    categories = st.sidebar.multiselect("카테고리 선택", options=category_options, default=category_options)
+    selection = {"platform": platforms, "category": categories}
+
+    if live:
+        filtered_df = tag_frame(
+            df.take(filter_index.select(selection)),
+            filter_index.selection_key(selection)
+        )
+        if filtered_df.empty:
+            st.warning("선택한 조건에 맞는 데이터가 없습니다.")
+            return
+    elif not platforms or not categories:
         st.warning("선택한 조건에 맞는 데이터가 없습니다.")
         return
 
     # ------------------ 키워드 분석 파이프라인 ------------------
+    min_length = st.sidebar.slider("최소 키워드 길이", 2, 5, 2)
+    min_reviews = st.sidebar.slider("최소 리뷰 수", 1, 20, 5)
+
     with st.spinner("키워드를 분석하는 중..."):
-        keywords = extract_keywords_batch(
-            filtered_df["content"],
-            top_n=50,
-            min_length=st.sidebar.slider("최소 키워드 길이", 2, 5, 2)
-        )
-        keyword_df = calculate_keyword_sentiment_streaming(
-            filtered_df,
-            keywords,
-            chunk_size=1_000
-        )
+        if live:
+            keywords = extract_keywords_batch(
+                filtered_df["content"],
+                top_n=50,
+                min_length=min_length,
+                pool=tokenizer_pool,
+                workers=tokenizer_workers,
+                review_uids=filtered_df["review_uid"],
+                token_store_path=token_store_path,
+                sketch_capacity=keyword_sketch_capacity,
+                tokenizer=tokenizer_backend
+            )
+            keyword_df = calculate_keyword_sentiment_streaming(
+                filtered_df,
+                keywords,
+                chunk_size=1_000
+            )
+        else:
+            keyword_df = rollup_keyword_cube(load_keyword_cube(
+                _backend=backend,
+                platforms=platforms,
+                categories=categories,
+                min_length=min_length,
+                top_n=50,
+                start_date=start_date,
+                end_date=end_date
+            ))
         keyword_df = keyword_df[
-            keyword_df["review_count"] >= st.sidebar.slider("최소 리뷰 수", 1, 20, 5)
+            keyword_df["review_count"] >= min_reviews
             ].reset_index(drop=True)
 
+    with st.sidebar.expander("⚙️ 형태소 분석 처리량"):
+        worker_stats = get_tokenizer_stats()
+        if worker_stats.empty:
+            st.caption("아직 실행 기록이 없습니다.")
+        else:
+            st.dataframe(worker_stats, use_container_width=True)
+
     # ---------------------- 주요 메트릭 ------------------------
+    if live:
+        total_reviews, avg_rating = filtered_df.shape[0], filtered_df['star'].mean()
+    else:
+        # 큐브는 키워드별 집계라 리뷰 수를 더하면 중복되므로 리뷰 단위 집계를 따로 조회
+        totals = load_review_totals(
+            _backend=backend,
+            platforms=platforms,
+            categories=categories,
+            start_date=start_date,
+            end_date=end_date
+        )
+        total_reviews = int(totals["review_count"].iloc[0])
+        avg_rating = pd.to_numeric(totals["avg_rating"]).iloc[0]  # 리뷰가 없으면 NULL → NaN
+
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("분석된 키워드 수", len(keyword_df))
     col2.metric("평균 긍정률", f"{keyword_df['positive_rate'].mean():.1f}%")
-    col3.metric("총 리뷰 수", f"{filtered_df.shape[0]:,}")
-    col4.metric("평균 별점", f"{filtered_df['star'].mean():.2f}")
+    col3.metric("총 리뷰 수", f"{total_reviews:,}")
+    col4.metric("평균 별점", f"{avg_rating:.2f}")
 
     st.markdown("---")
 
     # -------------------- 시각화 섹션 --------------------------
     st.subheader("🎯 키워드별 빈도 vs 긍정률")
-    st.plotly_chart(create_bubble_chart(keyword_df), use_container_width=True)
+    with stage("plotly_chart:bubble"):
+        st.plotly_chart(create_bubble_chart(keyword_df), use_container_width=True)
 
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("📈 상위 키워드 빈도")
-        st.plotly_chart(create_top_keywords_chart(keyword_df, top_n=20), use_container_width=True)
+        with stage("plotly_chart:top_keywords"):
+            st.plotly_chart(create_top_keywords_chart(keyword_df, top_n=20), use_container_width=True)
     with col2:
         st.subheader("📊 긍정률 분포")
-        st.plotly_chart(create_sentiment_distribution_chart(keyword_df), use_container_width=True)
+        with stage("plotly_chart:sentiment_distribution"):
+            st.plotly_chart(create_sentiment_distribution_chart(keyword_df), use_container_width=True)
 
     st.subheader("🔗 지표 간 상관관계")
-    st.plotly_chart(create_correlation_matrix(keyword_df), use_container_width=True)
+    with stage("plotly_chart:correlation"):
+        st.plotly_chart(create_correlation_matrix(keyword_df), use_container_width=True)
 
     st.markdown("---")
 
-    # --------------- 키워드→리뷰 리스트 기능 -------------------
+    # ---------------------- 키워드 트렌드 ----------------------
+    if not keyword_df.empty:
+        with stage("keyword_trends"):
+            if live:
+                counters = build_trend_counters(filtered_df, keyword_df["keyword"].tolist())
+            else:
+                counters = KeywordTrendCounters.from_cube(load_keyword_cube_daily(
+                    _backend=backend,
+                    platforms=platforms,
+                    categories=categories,
+                    keywords=keyword_df["keyword"].tolist(),
+                    start_date=start_date,
+                    end_date=end_date
+                ))
+        show_keyword_trends(counters)
+        st.markdown("---")
+
+    # ------------- 리뷰 단위 탐색 (사전 집계 모드는 샘플) -------------
+    if not live:
+        st.subheader("🔎 리뷰 샘플 탐색")
+        st.info(
+            f"아래 키워드 리뷰·비교·검색은 전체 데이터가 아니라 최신 {data_limit:,}개 리뷰 샘플 기준입니다. "
+            "위의 지표·차트·트렌드(전체 데이터)와 수치가 다를 수 있습니다."
+        )
+        if not st.checkbox("리뷰 샘플 불러오기", key="load_keyword_review_sample"):
+            return
+        df = load_review_sample(backend, data_limit, start_date, end_date)
+        filter_index = get_filter_index(df, frame_fingerprint(df))
+        filtered_df = tag_frame(
+            df.take(filter_index.select(selection)),
+            filter_index.selection_key(selection)
+        )
+        if filtered_df.empty:
+            st.warning("샘플에 선택한 조건에 맞는 리뷰가 없습니다.")
+            return
+
+    show_review_exploration(df, filtered_df, keyword_df)
+
+
+def load_review_sample(backend, data_limit, start_date=None, end_date=None):
+    """최신 data_limit 개 리뷰 로드 + 사이드바에 예상 스캔량·메모리 표시"""
+    date_range = {"start_date": start_date, "end_date": end_date}
+    with st.spinner("데이터를 로드하는 중..."):
+        # 리뷰 로드와 스캔량 드라이런 2회는 서로 독립적이므로 동시에 실행
+        results = run_concurrently({
+            "reviews": (partial(load_predicted_reviews, _backend=backend, limit=data_limit, **date_range),),
+            "scan_bytes": (partial(estimate_scan_bytes, _backend=backend, limit=data_limit, **date_range),)
+        })
+    df = results["reviews"]  # 데이터 백엔드 → DataFrame
+
+    # 조회 기간이 줄이는 스캔량 (드라이런 추정, 로컬 백엔드에서는 표시 안 함)
+    range_bytes, full_bytes = results["scan_bytes"]
+    if range_bytes is not None and full_bytes is not None:
+        st.sidebar.caption(
+            f"📉 예상 스캔: {range_bytes / 1024 ** 2:,.1f} MB "
+            f"(전체 기간 {full_bytes / 1024 ** 2:,.1f} MB)"
+        )
+
+    st.success(f"총 {len(df):,}개의 리뷰 데이터를 로드했습니다.")
+    memory_usage = df.attrs.get("memory_usage")
+    if memory_usage:
+        st.sidebar.caption(
+            f"🧮 데이터 메모리: {memory_usage['before'] / 1024 ** 2:,.1f} MB → "
+            f"{memory_usage['after'] / 1024 ** 2:,.1f} MB"
+        )
+    return df
+
+
+def show_review_exploration(df, filtered_df, keyword_df):
+    """키워드→리뷰 리스트, 키워드 비교, 본문 검색 (로드된 리뷰 기준)"""
+    # 본문 n-gram 색인은 필터 전 데이터셋에 한 번만 만들고, 필터된 행은 index 라벨로 교차한다
+    with stage("search_index"):
+        search_index = get_search_index(df, frame_fingerprint(df))
     selected_keyword = create_keyword_filter_section(keyword_df, filtered_df)
     if selected_keyword:
         st.markdown("---")
@@ -94,9 +235,9 @@ def keyword_analysis_page(client):
             f"- 평균 별점: {info['avg_rating']:.2f}/5"
         )
 
-        reviews_to_show = display_keyword_reviews(filtered_df, selected_keyword)
+        reviews_to_show = display_keyword_reviews(filtered_df, selected_keyword, search_index=search_index)
         if reviews_to_show is not None and not reviews_to_show.empty:
-            render_review_cards(reviews_to_show, selected_keyword)
+            render_review_list(reviews_to_show, [selected_keyword], key=f"keyword_reviews_{selected_keyword}")
             st.markdown("### 💾 리뷰 데이터 다운로드")
             st.download_button(
                 label=f"📥 '{selected_keyword}' 리뷰 CSV 다운로드",
@@ -106,5 +247,60 @@ def keyword_analysis_page(client):
             )
 
     st.markdown("---")
-    create_keyword_comparison_section(keyword_df, filtered_df)
-    add_search_functionality(filtered_df)
+    with stage("keyword_matrix"):
+        keyword_matrix = build_keyword_matrix(filtered_df, keyword_df["keyword"].tolist())
+    create_keyword_comparison_section(keyword_df, keyword_matrix)
+    add_search_functionality(filtered_df, search_index=search_index)
+
+
+def show_keyword_trends(counters):
+    """최근 기간 비교 표와 키워드 추이 차트"""
+    st.subheader("📆 키워드 트렌드")
+    if len(counters.days) == 0:
+        st.info("트렌드를 계산할 데이터가 없습니다.")
+        return
+
+    col1, col2 = st.columns(2)
+    window_days = col1.radio("비교 기간", [7, 30], format_func=lambda d: f"최근 {d}일 vs 직전 {d}일",
+                             horizontal=True)
+    metric = col2.radio("지표", ["review_count", "positive_rate"],
+                        format_func={"review_count": "리뷰 수", "positive_rate": "긍정률"}.get,
+                        horizontal=True)
+    st.caption(f"기준일: {pd.Timestamp(counters.last_day):%Y-%m-%d} (데이터의 마지막 날짜)")
+
+    comparison = counters.period_over_period(window_days)
+    if comparison.attrs["previous_complete"]:
+        # 부정 리뷰가 가장 많이 늘어난 키워드 = 새로 떠오르는 불만
+        sort_by = "negative_count_change"
+    else:
+        st.warning(
+            f"로드된 데이터가 {pd.Timestamp(counters.days.min()):%Y-%m-%d} 부터라 직전 {window_days}일을 "
+            "온전히 포함하지 않습니다. 증감은 표시하지 않고 최근 부정 리뷰 수 순으로 보여줍니다."
+        )
+        sort_by = "negative_count"
+    comparison = comparison.sort_values(sort_by, ascending=False, kind="stable")
+    st.dataframe(
+        comparison.head(10).rename(columns={
+            "keyword": "키워드",
+            "review_count": "리뷰 수",
+            "previous_review_count": "직전 리뷰 수",
+            "review_count_change": "리뷰 수 증감",
+            "negative_count": "부정 리뷰 수",
+            "negative_count_change": "부정 리뷰 증감",
+            "positive_rate": "긍정률",
+            "positive_rate_change": "긍정률 증감"
+        }).round(1),
+        use_container_width=True,
+        hide_index=True
+    )
+
+    selected = st.multiselect(
+        "추이를 볼 키워드",
+        options=counters.keywords,
+        default=comparison["keyword"].head(5).tolist()
+    )
+    if selected:
+        # 일별 값은 들쭉날쭉하므로 7일 이동 합계 기준으로 그린다
+        daily_df = counters.daily(selected, rolling_days=7)
+        with stage("plotly_chart:keyword_trend"):
+            st.plotly_chart(create_keyword_trend_chart(daily_df, metric), use_container_width=True)
@@ -1,11 +1,18 @@
+import datetime as dt
 import streamlit as st
 
-from config import get_bigquery_client
-from product_reviews_page import product_review_page
-from keywords_view_page import keyword_analysis_page
+from config import get_data_backend, get_session_ledger, get_backend_health, tokenizer_backend, \
+    default_date_range_days
+from cache_keys import get_cache_stats
+from shared_cache import get_shared_cache_stats
+from data_backend import QueryBudgetExceeded
+from instrumentation import start_rerun, show_stage_panel
+from keyword_analyzer import start_tokenizer_warmup
 
 
 def main():
+    start_rerun()
+
     # 사이드바에 페이지 선택 추가
     st.sidebar.title("📋 메뉴")
     page = st.sidebar.selectbox(
@@ -15,9 +22,28 @@ def main():
             "상품별 리뷰 분석"
         ]
     )
-    client = get_bigquery_client()
+    start_date, end_date = select_date_range()
+    backend = get_data_backend()
+
+    # 첫 페이지를 그리는 동안 형태소 분석기(Okt 는 JVM)를 백그라운드에서 띄운다
+    start_tokenizer_warmup(tokenizer_backend)
+    show_backend_health(backend)
+
+    try:
+        render_page(page, backend, start_date, end_date)
+    except QueryBudgetExceeded as e:
+        st.error(f"❌ 쿼리 비용 예산 초과: {str(e)}")
 
+    show_query_costs()
+    show_cache_stats()
+    show_stage_panel()
+
+
+def render_page(page, backend, start_date=None, end_date=None):
+    # 페이지 모듈(plotly, 분석 모듈 등)은 해당 페이지를 열 때 import
     if page == "키워드 분석":
+        from keywords_view_page import keyword_analysis_page
+
         st.set_page_config(
             page_title="리뷰 데이터 분석 대시보드",
             page_icon="📊",
@@ -26,10 +52,95 @@ def main():
         )
         st.title("📊 키워드별 빈도 + 긍정률 분석 대시보드")
         st.markdown("---")
-        keyword_analysis_page(client=client)
+        keyword_analysis_page(backend=backend, start_date=start_date, end_date=end_date)
 
     elif page == "상품별 리뷰 분석":
-        product_review_page(client=client)
+        from product_reviews_page import product_review_page
+
+        product_review_page(backend=backend, start_date=start_date, end_date=end_date)
+
+
+# 조회 기간 프리셋 → 일 수 (None: 전체 기간, 0: 직접 선택)
+DATE_RANGE_PRESETS = {
+    "최근 7일": 7,
+    "최근 30일": 30,
+    "최근 90일": 90,
+    "최근 1년": 365,
+    "전체 기간": None,
+    "직접 선택": 0
+}
+
+
+def select_date_range():
+    """
+    사이드바 조회 기간 선택 → (start_date, end_date), 열린 쪽은 None.
+    모든 쿼리의 created_at/run_date 조건으로 들어가 파티션·클러스터 가지치기에 쓰인다.
+    """
+    labels = list(DATE_RANGE_PRESETS)
+    default = next(
+        (label for label, days in DATE_RANGE_PRESETS.items() if days == (default_date_range_days or None)),
+        "전체 기간"
+    )
+    preset = st.sidebar.selectbox("📅 조회 기간", labels, index=labels.index(default), key="date_range_preset")
+    days = DATE_RANGE_PRESETS[preset]
+    today = dt.date.today()
+
+    if days is None:
+        return None, None
+    if days == 0:
+        picked = st.sidebar.date_input(
+            "시작일 ~ 종료일",
+            value=(today - dt.timedelta(days=29), today),
+            max_value=today,
+            key="date_range_custom"
+        )
+        # 시작일만 고른 상태에서는 종료일을 열어 둔다
+        return (picked[0], picked[1]) if len(picked) == 2 else (picked[0] if picked else None, None)
+    # 오늘 이후 리뷰는 없으므로 종료일 조건은 걸지 않는다
+    return today - dt.timedelta(days=days - 1), None
+
+
+def show_backend_health(backend):
+    """사이드바에 백그라운드 연결 확인 결과 표시 (기다리지 않음)"""
+    if backend is None:
+        return
+    health = get_backend_health(backend)
+    if not health.done():
+        st.sidebar.caption("⏳ 데이터 백엔드 연결 확인 중...")
+    elif health.exception() is not None:
+        st.sidebar.error(f"❌ {backend.name} 연결 실패: {health.exception()}")
+    else:
+        st.sidebar.caption(f"✅ {backend.name} 연결 성공")
+
+
+def show_query_costs():
+    """사이드바에 이번 세션의 쿼리별 청구 바이트 표시"""
+    ledger = get_session_ledger()
+    with st.sidebar.expander(f"💰 쿼리 비용 ({ledger.total_bytes_billed / 1024 ** 2:,.1f} MB)"):
+        costs = ledger.to_frame()
+        if costs.empty:
+            st.caption("실행된 쿼리가 없습니다 (캐시 사용).")
+            return
+        st.dataframe(
+            costs.groupby('label')[['bytes_estimated', 'bytes_billed']].sum()
+            .sort_values('bytes_billed', ascending=False),
+            use_container_width=True
+        )
+
+
+def show_cache_stats():
+    """사이드바에 캐시 함수별 히트/미스와 키 계산 시간, 공유 캐시 히트/미스 표시"""
+    with st.sidebar.expander("🧪 캐시 디버그"):
+        stats = get_cache_stats()
+        if stats.empty:
+            st.caption("기록된 캐시 호출이 없습니다.")
+        else:
+            st.dataframe(stats.set_index('function'), use_container_width=True)
+
+        shared_stats = get_shared_cache_stats()
+        if not shared_stats.empty:
+            st.caption("공유 캐시 (프로세스 간)")
+            st.dataframe(shared_stats.set_index('function'), use_container_width=True)
 
 
 if __name__ == "__main__":
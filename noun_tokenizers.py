@@ -0,0 +1,155 @@
+"""
+명사 추출기(형태소 분석기) 백엔드
+1) okt   ─ konlpy Okt (JVM 필요, 기존 기본값)
+2) kiwi  ─ kiwipiepy (C++ 네이티브, 설치된 경우)
+3) mecab ─ python-mecab-ko 또는 konlpy Mecab (설치된 경우)
+4) regex ─ 의존성 없는 정규식 어절 + 조사 제거 (대체용)
+
+모든 백엔드는 nouns(text) -> list[str] 하나만 구현하면 되고,
+인스턴스는 스레드(워커 프로세스)마다 한 번 만들어 재사용한다.
+konlpy 의 JVM 기동은 잠금 없는 확인 후 시작이므로 인스턴스 생성은 프로세스 잠금으로 직렬화한다.
+"""
+import re
+import threading
+import importlib.util
+
+
+class Tokenizer:
+    """명사 추출기 인터페이스"""
+
+    name = ""
+    # 같은 입력의 결과가 바뀌면 올린다 (토큰 저장소 키에 들어가 예전 결과를 다시 쓰지 않음)
+    version = 1
+
+    def nouns(self, text: str) -> list[str]:
+        raise NotImplementedError
+
+
+class OktTokenizer(Tokenizer):
+    name = "okt"
+
+    def __init__(self):
+        from konlpy.tag import Okt  # JVM 을 띄우므로 실제로 필요할 때 import
+
+        self._okt = Okt()
+
+    def nouns(self, text: str) -> list[str]:
+        return self._okt.nouns(text)
+
+
+class KiwiTokenizer(Tokenizer):
+    name = "kiwi"
+
+    def __init__(self):
+        from kiwipiepy import Kiwi
+
+        self._kiwi = Kiwi()
+
+    def nouns(self, text: str) -> list[str]:
+        # 일반·고유 명사 (NNG, NNP)
+        return [token.form for token in self._kiwi.tokenize(text) if token.tag in ("NNG", "NNP")]
+
+
+class MecabTokenizer(Tokenizer):
+    name = "mecab"
+
+    def __init__(self):
+        if importlib.util.find_spec("mecab") is not None:
+            from mecab import MeCab  # python-mecab-ko (사전 포함 휠)
+
+            self._mecab = MeCab()
+        else:
+            from konlpy.tag import Mecab  # 시스템에 설치된 mecab-ko-dic 사용
+
+            self._mecab = Mecab()
+
+    def nouns(self, text: str) -> list[str]:
+        return self._mecab.nouns(text)
+
+
+class RegexTokenizer(Tokenizer):
+    """
+    형태소 분석 없이 한글 어절에서 흔한 조사·어미를 떼어낸 어간을 명사 후보로 쓴다.
+    서술어("좋아요", "빨라요" 등)도 일부 섞이므로 품질은 낮지만 의존성·초기화 비용이 없다.
+    """
+
+    name = "regex"
+    version = 2
+
+    _WORD = re.compile(r"[가-힣]{2,}|[A-Za-z]{2,}")
+    # 어간이 2글자 이상 남을 때만, 그중 가장 긴 조사를 떼어낸다 (바다는 → 바다, 나이 → 나이)
+    _SUFFIX = re.compile(
+        r"^(.{2,}?)(에서는|에서|으로|까지|부터|처럼|보다|이랑|하고|이나|은|는|이|가|을|를|에|의|로|와|과|도|만|랑)$"
+    )
+    # 두 글자 이상의 어미만 서술어로 본다 - 한 글자(서/지/다 등)로 끝나는 명사(배송지, 바다)를 버리지 않게
+    _PREDICATE = re.compile(
+        r"(아요|어요|여요|해요|라요|에요|예요|네요|세요|지요|니다|는데|지만|해서|아서|어서|"
+        r"았다|었다|였다|했다|한다|하다|있다|없다|같다|좋다)$"
+    )
+
+    def nouns(self, text: str) -> list[str]:
+        nouns = []
+        for word in self._WORD.findall(text):
+            if self._PREDICATE.search(word):
+                continue
+            match = self._SUFFIX.match(word)
+            nouns.append(match.group(1) if match else word)
+        return nouns
+
+
+TOKENIZER_BACKENDS = {
+    "okt": (OktTokenizer, ("konlpy", "jpype")),
+    "kiwi": (KiwiTokenizer, ("kiwipiepy",)),
+    "mecab": (MecabTokenizer, ("mecab",)),
+    "regex": (RegexTokenizer, ()),
+}
+
+_local = threading.local()
+# 여러 스레드가 동시에 처음 생성하면 JVM 을 두 번 띄우려다 실패할 수 있다
+_create_lock = threading.Lock()
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def available_tokenizers() -> list[str]:
+    """현재 환경에서 쓸 수 있는 백엔드 이름"""
+    available = []
+    for name, (_, modules) in TOKENIZER_BACKENDS.items():
+        if name == "mecab":
+            # python-mecab-ko 가 없으면 konlpy Mecab (시스템 mecab 필요)
+            ok = _installed("mecab") or (_installed("konlpy") and _installed("MeCab"))
+        else:
+            ok = all(_installed(m) for m in modules)
+        if ok:
+            available.append(name)
+    return available
+
+
+def resolve_tokenizer(name: str) -> str:
+    """'auto' 는 설치된 백엔드 중 가장 빠른 것 (kiwi → mecab → okt → regex)"""
+    if name != "auto":
+        if name not in TOKENIZER_BACKENDS:
+            raise ValueError(f"알 수 없는 형태소 분석기: {name} ({', '.join(TOKENIZER_BACKENDS)})")
+        return name
+    available = available_tokenizers()
+    return next(n for n in ("kiwi", "mecab", "okt", "regex") if n in available)
+
+
+def tokenizer_store_key(name: str) -> str:
+    """토큰 저장소에서 백엔드 결과를 구분하는 키 - 버전 1 은 예전 저장분과 호환되게 이름만 쓴다"""
+    version = TOKENIZER_BACKENDS[name][0].version
+    return name if version == 1 else f"{name}:v{version}"
+
+
+def get_tokenizer(name: str = "okt") -> Tokenizer:
+    """현재 스레드(프로세스)의 백엔드 인스턴스 - 한 번 만든 뒤 계속 재사용"""
+    instances = getattr(_local, "instances", None)
+    if instances is None:
+        instances = _local.instances = {}
+    tokenizer = instances.get(name)
+    if tokenizer is None:
+        with _create_lock:
+            tokenizer = instances[name] = TOKENIZER_BACKENDS[name][0]()
+    return tokenizer
@@ -2,20 +2,24 @@ import pandas as pd
 import streamlit as st
 from data_processor import (
     load_products_for_selection,
-    load_product_reviews_with_sentiment,
-    get_available_categories_and_platforms
+    load_product_sentiment_summary,
+    load_product_review_samples,
+    get_available_categories_and_platforms,
+    prefetch,
+    SAMPLE_ORDER_BY
 )
 
 
-def product_review_page(client):
-    """상품별 리뷰 분석 페이지"""
+def product_review_page(backend, start_date=None, end_date=None):
+    """상품별 리뷰 분석 페이지 (리뷰 수·감성 집계·샘플은 start_date~end_date 기간 기준)"""
+    date_range = {"start_date": start_date, "end_date": end_date}
 
     st.title("📊 상품별 리뷰 분석")
     st.markdown("---")
 
     # 1. 먼저 사용 가능한 카테고리와 플랫폼 목록 로드
     with st.spinner("카테고리 및 플랫폼 정보 로딩 중..."):
-        available_categories, available_platforms = get_available_categories_and_platforms(_client=client)
+        available_categories, available_platforms = get_available_categories_and_platforms(_backend=backend)
 
     if not available_categories or not available_platforms:
         st.error("카테고리 또는 플랫폼 정보를 불러올 수 없습니다.")
@@ -53,14 +57,14 @@ def product_review_page(client):
 
     # 4. 선택된 조건에 따라 상품 데이터 로드
     product_limit = 100
-    product_review_limit = 500
 
     with st.spinner("선택된 조건에 맞는 상품 데이터 로딩 중..."):
         products_df = load_products_for_selection(
-            _client=client,
+            _backend=backend,
             categories=selected_categories,
             platforms=selected_platforms,
-            limit=product_limit
+            limit=product_limit,
+            **date_range
         )
 
     if products_df.empty:
@@ -68,6 +72,14 @@ def product_review_page(client):
         st.info("카테고리와 플랫폼 조합을 확인하거나 더 넓은 범위로 선택해보시기 바랍니다.")
         return
 
+    # 가장 리뷰가 많은 상품의 감성 집계를 미리 받아 둔다 (선택하면 바로 표시)
+    prefetch(
+        load_product_sentiment_summary,
+        _backend=backend,
+        product_id=products_df.iloc[0]['product_id'],
+        **date_range
+    )
+
     # 5. 조건에 맞는 상품 수 표시
     st.success(f"✅ 선택된 조건에 맞는 상품: **{len(products_df)}개** (리뷰 수 많은 순)")
 
@@ -128,113 +140,89 @@ def product_review_page(client):
 
     st.markdown("---")
 
-    # 8. 리뷰 데이터 로드 및 분석 (기존 코드와 동일)
+    # 8. 상품 전체 리뷰에 대한 감성 집계 (GROUP BY 결과만 로드)
     with st.spinner("리뷰 데이터 분석 중..."):
-        reviews_df = load_product_reviews_with_sentiment(
-            _client=client,
+        summary_df = load_product_sentiment_summary(
+            _backend=backend,
             product_id=selected_product_id,
-            limit=product_review_limit
+            **date_range
         )
 
-    if reviews_df.empty:
+    if summary_df.empty:
         st.warning("이 상품에 대한 리뷰 데이터가 없습니다.")
         return
 
     # 감성 분석 결과
-    sentiment_counts = reviews_df['sentiment'].value_counts()
+    sentiment_counts = summary_df.groupby('pred_label')['review_count'].sum()
+    total_reviews = int(summary_df['review_count'].sum())
 
-    if 'is_correct' in reviews_df.columns:
-        accuracy = reviews_df['is_correct'].mean() * 100
+    labeled_count = summary_df['labeled_count'].sum()
+    if labeled_count > 0:
+        accuracy = summary_df['correct_count'].sum() / labeled_count * 100
         st.metric("🎯 예측 정확도", f"{accuracy:.1f}%")
 
-    st.markdown("### 📊 리뷰 감성 분석")
+    st.markdown(f"### 📊 리뷰 감성 분석 (전체 {total_reviews:,}개)")
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        positive_count = sentiment_counts.get('positive', 0)
-        positive_rate = (positive_count / len(reviews_df)) * 100
+        positive_count = int(sentiment_counts.get('positive', 0))
+        positive_rate = (positive_count / total_reviews) * 100
         st.metric("😊 긍정 리뷰", f"{positive_count}개", f"{positive_rate:.1f}%")
 
     with col2:
-        negative_count = sentiment_counts.get('negative', 0)
-        negative_rate = (negative_count / len(reviews_df)) * 100
+        negative_count = int(sentiment_counts.get('negative', 0))
+        negative_rate = (negative_count / total_reviews) * 100
         st.metric("😞 부정 리뷰", f"{negative_count}개", f"{negative_rate:.1f}%")
 
     with col3:
-        neutral_count = sentiment_counts.get('neutral', 0)
-        neutral_rate = (neutral_count / len(reviews_df)) * 100
+        neutral_count = int(sentiment_counts.get('neutral', 0))
+        neutral_rate = (neutral_count / total_reviews) * 100
         st.metric("😐 중립 리뷰", f"{neutral_count}개", f"{neutral_rate:.1f}%")
 
-    # 감성별 리뷰 샘플 (기존 코드와 동일)
+    from chart_generator import create_star_distribution_chart  # plotly 는 차트를 그릴 때 로드
+
+    st.plotly_chart(create_star_distribution_chart(summary_df), use_container_width=True)
+
+    # 감성별 리뷰 샘플 - 요청할 때만 원본 리뷰를 로드
     st.markdown("### 💬 리뷰 샘플 보기")
+    if not st.checkbox("리뷰 샘플 불러오기", key="load_review_samples"):
+        return
+
     tab1, tab2, tab3 = st.tabs(["😊 긍정 리뷰", "😞 부정 리뷰", "😐 중립 리뷰"])
 
     with tab1:
-        show_sentiment_samples(reviews_df, 'positive', '긍정')
+        show_sentiment_samples(backend, selected_product_id, 'positive', '긍정', positive_count, date_range)
     with tab2:
-        show_sentiment_samples(reviews_df, 'negative', '부정')
+        show_sentiment_samples(backend, selected_product_id, 'negative', '부정', negative_count, date_range)
     with tab3:
-        show_sentiment_samples(reviews_df, 'neutral', '중립')
+        show_sentiment_samples(backend, selected_product_id, 'neutral', '중립', neutral_count, date_range)
 
 
-def show_sentiment_samples(reviews_df, sentiment_type, sentiment_name):
-    """특정 감성의 리뷰 샘플 표시 (기존 코드와 동일)"""
-    sentiment_reviews = reviews_df[reviews_df['sentiment'] == sentiment_type]
+def show_sentiment_samples(backend, product_id, sentiment_type, sentiment_name, total_reviews, date_range=None):
+    """특정 감성의 리뷰 샘플 표시 - 정렬·페이지는 쿼리에서 처리"""
+    from ui_components import review_pager, render_review_cards  # plotly 를 함께 로드하므로 필요할 때 import
 
-    if sentiment_reviews.empty:
+    if total_reviews == 0:
         st.info(f"{sentiment_name} 리뷰가 없습니다.")
         return
 
-    total_reviews = len(sentiment_reviews)
-    if total_reviews == 1:
-        st.info(f"{sentiment_name} 리뷰가 1개 있습니다.")
-        sample_count = 1
-    else:
-        sample_count = st.slider(
-            f"{sentiment_name} 리뷰 샘플 개수",
-            min_value=1,
-            max_value=min(15, total_reviews),
-            value=min(10, total_reviews),
-            key=f"{sentiment_type}_count"
-        )
-
     # 정렬 방식
     sort_by = st.selectbox(
         f"{sentiment_name} 리뷰 정렬",
-        ["최신순", "오래된순", "별점 높은순", "별점 낮은순"],
+        list(SAMPLE_ORDER_BY.keys()),
         key=f"{sentiment_type}_sort"
     )
 
-    # 정렬 적용
-    if sort_by == "최신순":
-        sorted_reviews = sentiment_reviews.sort_values('created_at', ascending=False)
-    elif sort_by == "오래된순":
-        sorted_reviews = sentiment_reviews.sort_values('created_at', ascending=True)
-    elif sort_by == "별점 높은순":
-        sorted_reviews = sentiment_reviews.sort_values('star', ascending=False)
-    else:  # 별점 낮은순
-        sorted_reviews = sentiment_reviews.sort_values('star', ascending=True)
-
-    # 샘플 표시
-    samples = sorted_reviews.head(sample_count)
-
-    # 감성별 배경색 설정
-    bg_colors = {
-        'positive': '#d1f2eb',
-        'negative': '#fadbd8',
-        'neutral': '#fef9e7'
-    }
-
-    for idx, review in samples.iterrows():
-        # 리뷰 카드 표시
-        st.markdown(f"""
-        <div style="background-color: {bg_colors[sentiment_type]}; padding: 15px; border-radius: 10px; margin: 10px 0;">
-            <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
-                <span style="font-weight: bold;">⭐ {review['star']}점</span>
-                <span style="color: #666; font-size: 0.9em;">{review['created_at'].strftime('%Y-%m-%d')}</span>
-            </div>
-            <div style="line-height: 1.6;">
-                {review['content']}
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+    # 현재 페이지 분량만 LIMIT/OFFSET 으로 조회
+    start, page_size = review_pager(total_reviews, key=f"{sentiment_type}_samples")
+    samples = load_product_review_samples(
+        _backend=backend,
+        product_id=product_id,
+        sentiment=sentiment_type,
+        sort_by=sort_by,
+        limit=page_size,
+        offset=start,
+        **(date_range or {})
+    )
+
+    render_review_cards(samples, snippet_width=None, show_meta=False)
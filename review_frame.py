@@ -0,0 +1,42 @@
+"""
+리뷰 DataFrame 메모리 최적화 (Streamlit·설정 없이 쓰는 순수 함수 - 벤치마크에서도 사용)
+"""
+import pandas as pd
+
+
+# 카테고리형으로 바꿀 저카디널리티 컬럼
+CATEGORICAL_COLUMNS = ('platform', 'category', 'true_label')
+SENTIMENT_LABELS = ['negative', 'neutral', 'positive']
+
+
+def compact_review_frame(df):
+    """
+    리뷰 DataFrame 을 작은 컬럼 타입으로 변환한다.
+
+    platform/category/true_label → category, pred_label → 고정 순서 category(int8 코드),
+    star → int8, content → Arrow 문자열. 변환 전후 메모리는 df.attrs['memory_usage'] 에 남긴다.
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    df = df.copy()
+
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+
+    if 'pred_label' in df.columns:
+        extra = sorted(set(df['pred_label'].dropna().astype(str)) - set(SENTIMENT_LABELS))
+        df['pred_label'] = df['pred_label'].astype(
+            pd.CategoricalDtype(SENTIMENT_LABELS + extra, ordered=False)
+        )
+
+    if 'star' in df.columns:
+        df['star'] = pd.to_numeric(df['star']).astype('int8')
+
+    if 'content' in df.columns:
+        df['content'] = df['content'].astype('string[pyarrow]')
+
+    df.attrs['memory_usage'] = {
+        'before': before,
+        'after': int(df.memory_usage(deep=True).sum())
+    }
+    return df
@@ -0,0 +1,110 @@
+"""
+리뷰 본문 검색용 문자 n-gram 역색인
+데이터셋을 로드할 때 한 번, 본문(소문자)의 문자 2-gram·3-gram → 행 번호 posting list 를 만들어 두고
+검색어는 n-gram posting list 교집합으로 후보를 좁힌 뒤 후보만 실제 부분 문자열 검사로 확인한다.
+형태소 분석 없이 글자 단위로 색인하므로 띄어쓰기·조사가 섞인 한국어에도 그대로 쓸 수 있다.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+# 유니코드 코드 포인트(+1)는 21 비트 이하 → 3-gram 까지 int64 하나로 인코딩
+# (+1 로 0 을 비워 두면 3-gram 값은 항상 2-gram 값보다 커서 서로 겹치지 않는다)
+_CODE_BITS = 21
+_BUILD_CHUNK = 50_000
+
+
+def _code_points(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.int64) + 1
+
+
+def _encode_ngrams(codes: np.ndarray, n: int) -> np.ndarray:
+    """연속한 n 글자 → 정수 하나"""
+    grams = np.zeros(len(codes) - n + 1, dtype=np.int64)
+    for offset in range(n):
+        grams = (grams << _CODE_BITS) | codes[offset:len(codes) - n + 1 + offset]
+    return grams
+
+
+def _sorted_unique_pairs(grams: np.ndarray, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(gram, row) 쌍을 gram → row 순으로 정렬하고 중복 제거"""
+    order = np.lexsort((rows, grams))
+    grams, rows = grams[order], rows[order]
+    keep = np.ones(len(grams), dtype=bool)
+    keep[1:] = (grams[1:] != grams[:-1]) | (rows[1:] != rows[:-1])
+    return grams[keep], rows[keep]
+
+
+class NgramIndex:
+    """문자 n-gram → 행 위치(CSR posting list)"""
+
+    def __init__(self, texts: pd.Series, ngram_sizes=(2, 3), dataset_key: str = ""):
+        self.dataset_key = dataset_key
+        self.ngram_sizes = tuple(sorted(ngram_sizes))
+        self.labels = texts.index.to_numpy()
+        self.n_rows = len(texts)
+
+        texts = texts.fillna("").astype(str).str.lower()
+        gram_parts, row_parts = [], []
+        for start in range(0, self.n_rows, _BUILD_CHUNK):
+            chunk = texts.iloc[start:start + _BUILD_CHUNK]
+            lengths = chunk.str.len().to_numpy()
+            codes = _code_points("".join(chunk))
+            rows = np.repeat(np.arange(start, start + len(chunk), dtype=np.int64), lengths)
+
+            for n in self.ngram_sizes:
+                if len(codes) < n:
+                    continue
+                grams = _encode_ngrams(codes, n)
+                # 리뷰 경계를 넘는 n-gram 제외
+                same_row = rows[:len(rows) - n + 1] == rows[n - 1:]
+                chunk_grams, chunk_rows = _sorted_unique_pairs(grams[same_row], rows[:len(rows) - n + 1][same_row])
+                gram_parts.append(chunk_grams)
+                row_parts.append(chunk_rows)
+
+        grams = np.concatenate(gram_parts) if gram_parts else np.empty(0, dtype=np.int64)
+        rows = np.concatenate(row_parts) if row_parts else np.empty(0, dtype=np.int64)
+        grams, rows = _sorted_unique_pairs(grams, rows)
+        self.postings = rows.astype(np.int32)
+
+        # CSR: grams[i] 의 posting = postings[offsets[i]:offsets[i + 1]] (행 번호 오름차순)
+        self.grams, starts = np.unique(grams, return_index=True)
+        self.offsets = np.append(starts, len(grams))
+
+    @property
+    def nbytes(self) -> int:
+        return self.grams.nbytes + self.offsets.nbytes + self.postings.nbytes
+
+    def _posting(self, gram: int) -> np.ndarray:
+        i = np.searchsorted(self.grams, gram)
+        if i == len(self.grams) or self.grams[i] != gram:
+            return np.empty(0, dtype=np.int32)
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def candidate_rows(self, term: str) -> np.ndarray | None:
+        """검색어의 모든 n-gram 을 가진 행 위치(오름차순) - 색인으로 좁힐 수 없으면 None"""
+        term = term.lower()
+        n = max((size for size in self.ngram_sizes if size <= len(term)), default=None)
+        if n is None:
+            return None
+
+        grams = np.unique(_encode_ngrams(_code_points(term), n))
+        postings = sorted((self._posting(g) for g in grams), key=len)
+        rows = postings[0]
+        for posting in postings[1:]:
+            if len(rows) == 0:
+                break
+            rows = np.intersect1d(rows, posting, assume_unique=True)
+        return rows
+
+    def candidate_labels(self, term: str) -> np.ndarray | None:
+        """candidate_rows 를 색인을 만든 DataFrame 의 index 라벨로"""
+        rows = self.candidate_rows(term)
+        return None if rows is None else self.labels[rows]
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_search_index(_df: pd.DataFrame, dataset_key: str, column: str = "content") -> NgramIndex:
+    """데이터셋(dataset_key)마다 한 번만 만드는 본문 n-gram 색인"""
+    return NgramIndex(_df[column], dataset_key=dataset_key)
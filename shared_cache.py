@@ -0,0 +1,283 @@
+"""
+프로세스·레플리카가 함께 쓰는 2차 결과 캐시
+st.cache_data(프로세스 내 1차 캐시)가 비었을 때 이 캐시를 먼저 보고, 없으면 계산한 뒤 저장한다.
+1) SQLiteCache ─ 같은 호스트의 프로세스끼리 쓰는 SQLite 파일 (TTL + 크기 기준 LRU 삭제)
+2) RedisCache  ─ Redis 프로토콜 서버, 여러 호스트의 레플리카용 (TTL, 크기 제한은 서버의 maxmemory-policy=allkeys-lru)
+DataFrame 은 Parquet(+attrs), 그 밖의 값은 pickle 로 직렬화한다.
+
+신뢰 경계: pickle 값은 읽을 때 임의 코드를 실행할 수 있으므로, 공유 캐시(특히 네트워크 Redis)는
+이 앱의 레플리카만 쓸 수 있어야 한다 (인증·네트워크 격리, 다른 서비스와 같은 DB 를 공유하지 않음).
+"""
+import io
+import os
+import time
+import pickle
+import sqlite3
+import inspect
+import threading
+import functools
+import pandas as pd
+
+from cache_keys import make_fingerprint, frame_fingerprint
+
+
+_FRAME, _PICKLE = b"F", b"P"
+
+
+def serialize(value) -> bytes:
+    """DataFrame → 'F' + attrs 길이(8바이트) + attrs pickle + Parquet, 그 외 → 'P' + pickle"""
+    if isinstance(value, pd.DataFrame):
+        attrs = pickle.dumps(value.attrs, protocol=pickle.HIGHEST_PROTOCOL)
+        buffer = io.BytesIO()
+        value.to_parquet(buffer, engine="pyarrow", compression="zstd", index=True)
+        return _FRAME + len(attrs).to_bytes(8, "little") + attrs + buffer.getvalue()
+    return _PICKLE + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def deserialize(data: bytes):
+    if data[:1] == _FRAME:
+        size = int.from_bytes(data[1:9], "little")
+        attrs = pickle.loads(data[9:9 + size])
+        df = pd.read_parquet(io.BytesIO(data[9 + size:]), engine="pyarrow")
+        df.attrs = attrs
+        return df
+    return pickle.loads(data[1:])
+
+
+class SQLiteCache:
+    """
+    같은 호스트의 여러 프로세스가 함께 쓰는 SQLite 캐시.
+
+    WAL 모드는 공유 메모리(-shm)를 쓰므로 NFS 같은 네트워크 파일시스템에서는 동작하지 않는다
+    (여러 호스트는 RedisCache). 읽기마다 쓰기 잠금을 잡지 않도록 LRU 용 접근 시각은
+    touch_interval 초보다 오래됐을 때만 갱신한다.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 2 * 1024 ** 3, touch_interval: float = 300.0):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.name = f"sqlite:{path}"
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key         TEXT PRIMARY KEY,
+                value       BLOB NOT NULL,
+                size        INTEGER NOT NULL,
+                expires_at  REAL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_entries_lru ON cache_entries (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> bytes | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, accessed_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, expires_at, accessed_at = row
+            if expires_at is not None and expires_at < now:
+                # 만료된 항목은 읽기에서 지우지 않고 다음 set 의 _evict 에 맡긴다
+                return None
+            if now - accessed_at >= self.touch_interval:
+                self._conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+            return value
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def set(self, key: str, value: bytes, ttl: float | None = None):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now + ttl if ttl else None, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        # 만료된 항목을 먼저 지우고, 그래도 크기를 넘으면 가장 오래 안 쓴 항목부터 삭제
+        self._conn.execute("DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at < ?", (now,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        victims, freed = [], 0
+        for key, size in self._conn.execute("SELECT key, size FROM cache_entries ORDER BY accessed_at"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM cache_entries WHERE key = ?", victims)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+
+
+class RedisCache:
+    """Redis 프로토콜 서버를 쓰는 캐시 (redis 패키지가 필요)"""
+
+    def __init__(self, url: str, prefix: str = "visualization:"):
+        import redis  # 선택 의존성 - Redis 캐시를 쓸 때만 필요
+
+        self.name = "redis"
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> bytes | None:
+        return self._client.get(self.prefix + key)
+
+    def delete(self, key: str):
+        self._client.delete(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float | None = None):
+        self._client.set(self.prefix + key, value, ex=int(ttl) if ttl else None)
+
+    def stats(self) -> dict:
+        info = self._client.info("memory")
+        return {"bytes": info.get("used_memory"), "max_bytes": info.get("maxmemory")}
+
+
+def open_shared_cache(url: str, max_bytes: int):
+    """'sqlite:///경로' 또는 'redis://호스트:포트/DB' → 캐시 객체 (빈 값이면 None)"""
+    if not url:
+        return None
+    if url.startswith("sqlite:///"):
+        return SQLiteCache(url[len("sqlite:///"):], max_bytes)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisCache(url)
+    raise ValueError(f"지원하지 않는 공유 캐시 주소: {url}")
+
+
+_stats_lock = threading.Lock()
+_shared_stats: dict[str, dict] = {}
+
+
+def _record(name: str, outcome: str, seconds: float = 0.0, size: int = 0):
+    """outcome: 'hits' | 'misses' | 'errors'"""
+    with _stats_lock:
+        s = _shared_stats.setdefault(
+            name, {"function": name, "hits": 0, "misses": 0, "errors": 0, "seconds": 0.0, "bytes": 0}
+        )
+        s[outcome] += 1
+        s["seconds"] += seconds
+        s["bytes"] += size
+
+
+def get_shared_cache_stats() -> pd.DataFrame:
+    """함수별 공유 캐시 히트/미스와 누적 조회·저장 시간, 주고받은 바이트"""
+    with _stats_lock:
+        return pd.DataFrame(list(_shared_stats.values()))
+
+
+def _current_cache():
+    # config 는 st.secrets 를 읽으므로 (벤치마크 등 streamlit 밖에서도 import 되도록) 호출 시점에 import
+    try:
+        from config import get_shared_cache
+    except Exception:
+        return None, None
+    return get_shared_cache()
+
+
+def cached_call(name: str, key: str, compute, ttl: float | None = None):
+    """공유 캐시에 key 가 있으면 그 값을, 없으면 compute() 결과를 저장하고 반환"""
+    cache, default_ttl = _current_cache()
+    if cache is None:
+        return compute()
+
+    full_key = f"{name}:{key}"
+    started = time.perf_counter()
+    try:
+        data = cache.get(full_key)
+    except Exception:
+        # 공유 캐시 장애는 계산으로 대신한다
+        _record(name, "errors")
+        data = None
+    lookup_seconds = time.perf_counter() - started
+    if data is not None:
+        try:
+            value = deserialize(data)
+        except Exception:
+            # 잘리거나 깨진(또는 다른 버전 라이브러리가 쓴) 항목은 지우고 미스로 처리
+            _record(name, "errors")
+            try:
+                cache.delete(full_key)
+            except Exception:
+                pass
+        else:
+            _record(name, "hits", time.perf_counter() - started, len(data))
+            return value
+
+    value = compute()
+    started = time.perf_counter()
+    try:
+        data = serialize(value)
+        cache.set(full_key, data, ttl if ttl is not None else default_ttl)
+        _record(name, "misses", lookup_seconds + time.perf_counter() - started, len(data))
+    except Exception:
+        _record(name, "errors")
+    return value
+
+
+def function_cache_name(func) -> str:
+    """모듈.함수 이름 + 바이트코드 지문 - 함수 코드가 바뀌면 이전 배포의 결과를 쓰지 않는다"""
+    # 계측 데코레이터 등으로 감싼 함수는 원본 코드로 지문을 만든다
+    func = inspect.unwrap(func)
+    code = getattr(func, "__code__", None)
+    # 중첩 코드 객체의 repr 에는 메모리 주소가 들어가 프로세스마다 달라지므로 제외
+    consts = [c for c in code.co_consts if not hasattr(c, "co_code")] if code is not None else []
+    version = make_fingerprint(code.co_code, consts) if code is not None else ""
+    return f"{func.__module__}.{func.__qualname__}@{version}"
+
+
+def _argument_key(name: str, value) -> str:
+    """캐시 키용 인자 표현 - '_' 로 시작하는 인자(백엔드 등)는 identity(프로젝트·데이터셋·테이블) 속성을 쓴다"""
+    if name.startswith("_"):
+        return f"{name}={getattr(value, 'identity', None) or getattr(value, 'name', type(value).__name__)}"
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return f"{name}=<{frame_fingerprint(value)}>"
+    return f"{name}={value!r}"
+
+
+def shared_cache(ttl: float | None = None):
+    """
+    공유 캐시 데코레이터 (st.cache_data 바로 안쪽에 둔다).
+
+    인자는 st.cache_data 와 같은 규칙으로 키를 만들되, 해시하지 않는 '_' 인자는
+    identity 속성(데이터 백엔드의 프로젝트·데이터셋·테이블)으로 구분한다.
+    """
+    def decorator(func):
+        name = function_cache_name(func)
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = make_fingerprint(*(_argument_key(k, v) for k, v in bound.arguments.items()))
+            return cached_call(name, key, lambda: func(*args, **kwargs), ttl)
+
+        return wrapper
+
+    return decorator
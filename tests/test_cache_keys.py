@@ -0,0 +1,30 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("streamlit")
+
+from cache_keys import frame_fingerprint, tag_frame
+
+
+def _tagged():
+    df = pd.DataFrame({"review": ["좋아요", "별로", "배송 빠름", "최고"], "score": [5, 1, 4, 5]})
+    return tag_frame(df, "review-source")
+
+
+def test_filtered_frame_gets_new_fingerprint():
+    df = _tagged()
+    # 같은 길이·같은 처음/끝 인덱스가 되도록 가운데 행만 바꾼 두 필터
+    first = df[df.index != 1]
+    second = df[df.index != 2]
+    assert first.attrs["fingerprint"] == second.attrs["fingerprint"] == "review-source"
+    assert frame_fingerprint(first) != frame_fingerprint(df)
+    assert frame_fingerprint(first) != frame_fingerprint(second)
+
+
+def test_column_selection_gets_new_fingerprint():
+    df = _tagged()
+    assert frame_fingerprint(df["review"]) != frame_fingerprint(df["score"])
+
+
+def test_same_rows_keep_fingerprint():
+    assert frame_fingerprint(_tagged()) == frame_fingerprint(_tagged())
@@ -0,0 +1,84 @@
+"""빈 쿼리 결과의 컬럼 유지(fetch_mode 무관)와 배치 작업용 예산 사본 확인"""
+import pytest
+
+pd = pytest.importorskip("pandas")
+pa = pytest.importorskip("pyarrow")
+
+from data_backend import BigQueryBackend, DuckDBBackend
+
+
+SCHEMA = pa.schema([("review_uid", pa.string()), ("platform", pa.string()), ("star", pa.int64())])
+
+
+class FakeRows:
+    """결과가 0행인 BigQuery RowIterator - to_arrow_iterable 은 배치를 주지 않는다"""
+
+    total_rows = 0
+
+    def to_arrow_iterable(self, bqstorage_client=None):
+        return iter(())
+
+    def to_arrow(self, bqstorage_client=None, create_bqstorage_client=True):
+        return SCHEMA.empty_table()
+
+    def to_dataframe(self):
+        return SCHEMA.empty_table().to_pandas()
+
+
+class FakeJob:
+    total_bytes_processed = 0
+    total_bytes_billed = 0
+    cache_hit = False
+
+    def result(self):
+        return FakeRows()
+
+
+class FakeClient:
+    def query(self, sql, job_config=None):
+        return FakeJob()
+
+
+@pytest.mark.parametrize("fetch_mode", ["arrow", "rest"])
+def test_bigquery_empty_result_keeps_columns(fetch_mode):
+    pytest.importorskip("google.cloud.bigquery")
+    backend = BigQueryBackend(FakeClient(), "project", "dataset", {}, fetch_mode=fetch_mode)
+    backend._bqstorage_client = object()
+
+    df = backend.query("SELECT review_uid, platform, star FROM t WHERE FALSE")
+
+    assert df.empty
+    assert list(df.columns) == ["review_uid", "platform", "star"]
+
+
+@pytest.mark.parametrize("fetch_mode", ["arrow", "rest"])
+def test_duckdb_empty_result_keeps_columns(tmp_path, fetch_mode):
+    pytest.importorskip("duckdb")
+    pd.DataFrame({"review_uid": ["a"], "platform": ["p"], "star": [5]}).to_parquet(
+        tmp_path / "predicted_review.parquet", index=False
+    )
+    backend = DuckDBBackend(str(tmp_path), fetch_mode=fetch_mode)
+
+    df = backend.query(
+        f"SELECT review_uid, platform, star FROM {backend.table('predicted_review')} WHERE star > @min_star",
+        {"min_star": 5}
+    )
+
+    assert df.empty
+    assert list(df.columns) == ["review_uid", "platform", "star"]
+
+
+def test_with_budget_copies_backend_with_own_limit_and_ledger():
+    session_ledger = object()
+    backend = BigQueryBackend(
+        FakeClient(), "project", "dataset", {"review": "reviews"},
+        max_bytes_per_query=10, ledger_provider=lambda: session_ledger
+    )
+
+    batch = backend.with_budget(0)
+
+    assert batch.max_bytes_per_query is None
+    assert batch.ledger is not session_ledger
+    assert batch.identity == backend.identity
+    assert backend.max_bytes_per_query == 10
+    assert backend.ledger is session_ledger
@@ -0,0 +1,17 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("streamlit")
+
+from keyword_trends import to_utc_days
+
+
+def test_aware_timestamps_bucket_by_utc_day():
+    seoul = pd.Series(pd.to_datetime(["2024-01-02 08:30"]).tz_localize("Asia/Seoul"))
+    assert str(to_utc_days(seoul)[0]) == "2024-01-01"
+
+
+def test_naive_timestamps_are_treated_as_utc():
+    naive = pd.Series(pd.to_datetime(["2024-01-01 23:30"]))
+    utc = pd.Series(pd.to_datetime(["2024-01-01 23:30"]).tz_localize("UTC"))
+    assert to_utc_days(naive)[0] == to_utc_days(utc)[0]
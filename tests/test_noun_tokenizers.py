@@ -0,0 +1,20 @@
+import pytest
+
+from noun_tokenizers import RegexTokenizer
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("배송지", ["배송지"]),
+    ("바다", ["바다"]),
+    ("배송지가", ["배송지"]),
+    ("바다는", ["바다"]),
+    ("포장지를", ["포장지"]),
+    ("나이", ["나이"]),
+    ("학교에서는", ["학교"]),
+])
+def test_regex_tokenizer_keeps_nouns_ending_in_particle_syllables(text, expected):
+    assert RegexTokenizer().nouns(text) == expected
+
+
+def test_regex_tokenizer_drops_predicates():
+    assert RegexTokenizer().nouns("배송이 빨라요 포장도 좋았다 만족합니다") == ["배송", "포장"]
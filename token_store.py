@@ -0,0 +1,83 @@
+"""
+리뷰별 명사 토큰 영구 저장소 (SQLite)
+(형태소 분석기, review_uid) → 추출한 명사 목록
+"""
+import os
+import sqlite3
+import threading
+import streamlit as st
+
+
+# SQLite 바인딩 변수 개수 제한(기본 999)보다 작게 나눠 조회
+_LOOKUP_CHUNK = 900
+
+
+class TokenStore:
+    """review_uid 별 명사 토큰을 디스크에 보관하는 저장소"""
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS review_nouns (
+                tokenizer  TEXT NOT NULL,
+                review_uid TEXT NOT NULL,
+                nouns      TEXT NOT NULL,
+                PRIMARY KEY (tokenizer, review_uid)
+            )
+            """
+        )
+        self._migrate_legacy_table()
+        self._conn.commit()
+
+    def _migrate_legacy_table(self):
+        # 형태소 분석기 구분이 없던 review_tokens 는 모두 Okt 결과였다
+        legacy = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'review_tokens'"
+        ).fetchone()
+        if legacy:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO review_nouns (tokenizer, review_uid, nouns) "
+                "SELECT 'okt', review_uid, nouns FROM review_tokens"
+            )
+            self._conn.execute("DROP TABLE review_tokens")
+
+    def get_many(self, review_uids: list[str], tokenizer: str = "okt") -> dict[str, list[str]]:
+        """저장된 uid 의 명사 목록 조회 (없는 uid 는 결과에서 빠짐)"""
+        found = {}
+        with self._lock:
+            for start in range(0, len(review_uids), _LOOKUP_CHUNK):
+                chunk = review_uids[start:start + _LOOKUP_CHUNK]
+                placeholders = ", ".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT review_uid, nouns FROM review_nouns "
+                    f"WHERE tokenizer = ? AND review_uid IN ({placeholders})",
+                    [tokenizer, *chunk]
+                )
+                for uid, nouns in rows:
+                    found[uid] = nouns.split(" ") if nouns else []
+        return found
+
+    def put_many(self, tokens: dict[str, list[str]], tokenizer: str = "okt"):
+        """uid 별 명사 목록 저장 (이미 있으면 덮어씀)"""
+        if not tokens:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO review_nouns (tokenizer, review_uid, nouns) VALUES (?, ?, ?)",
+                [(tokenizer, uid, " ".join(nouns)) for uid, nouns in tokens.items()]
+            )
+            self._conn.commit()
+
+
+@st.cache_resource(show_spinner=False)
+def get_token_store(path: str) -> TokenStore:
+    """프로세스 내에서 공유하는 TokenStore"""
+    return TokenStore(path)
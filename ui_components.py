@@ -1,8 +1,30 @@
+import re
+import html
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 
 
+# 1. 리뷰 필터 (Streamlit 호출 없는 순수 함수 - 벤치마크에서도 사용)
+def search_reviews(df, term, case=False, index=None, rank=False):
+    """
+    본문에 검색어가 포함된 리뷰 (원래 행 순서 유지).
+    index(search_index.NgramIndex)가 주어지면 n-gram 후보 행만 부분 문자열 검사하고,
+    rank=True 면 검색어 출현 횟수가 많은 순으로 (동률은 원래 순서) 정렬한다.
+    """
+    candidates = index.candidate_labels(term) if index is not None else None
+    if candidates is not None:
+        df = df[df.index.isin(candidates)]
+
+    results = df[df['content'].str.contains(term, na=False, case=case, regex=False)]
+    if rank and not results.empty:
+        pattern = re.escape(term) if case else f"(?i){re.escape(term)}"
+        occurrences = results['content'].str.count(pattern)
+        results = results.iloc[np.argsort(-occurrences.to_numpy(), kind="stable")]
+    return results
+
+
 # 2. 키워드 필터 리뷰 리스트
 def create_keyword_filter_section(keyword_df, df):
     """키워드 필터 섹션 생성"""
@@ -23,11 +45,11 @@ def create_keyword_filter_section(keyword_df, df):
     return None
 
 
-def display_keyword_reviews(df, keyword, max_reviews=50):
+def display_keyword_reviews(df, keyword, search_index=None):
     """선택된 키워드가 포함된 리뷰들을 출력"""
 
     # 키워드가 포함된 리뷰 필터링
-    keyword_reviews = df[df['content'].str.contains(keyword, na=False, case=False)]
+    keyword_reviews = search_reviews(df, keyword, index=search_index)
 
     if len(keyword_reviews) == 0:
         st.warning(f"'{keyword}' 키워드가 포함된 리뷰가 없습니다.")
@@ -104,95 +126,142 @@ def display_keyword_reviews(df, keyword, max_reviews=50):
             ascending=[False, False]
         )
 
-    # 표시할 리뷰 수 제한
-    display_reviews = filtered_reviews.head(max_reviews)
+    st.markdown(f"### 📝 '{keyword}' 관련 리뷰 ({len(filtered_reviews):,}개)")
 
-    st.markdown(f"### 📝 '{keyword}' 관련 리뷰 ({len(filtered_reviews):,}개 중 {len(display_reviews)}개 표시)")
+    return filtered_reviews
 
-    return display_reviews
 
+SENTIMENT_COLORS = {
+    'positive': '#d4edda',
+    'negative': '#f8d7da',
+    'neutral': '#fff3cd'
+}
 
-def render_review_cards(reviews_df, keyword):
-    """리뷰를 카드 형태로 렌더링"""
+SENTIMENT_ICONS = {
+    'positive': '😊',
+    'negative': '😞',
+    'neutral': '😐'
+}
 
-    for idx, review in reviews_df.iterrows():
-        # 감성에 따른 색상 설정
-        sentiment_colors = {
-            'positive': '#d4edda',
-            'negative': '#f8d7da',
-            'neutral': '#fff3cd'
-        }
+CARD_STYLE = (
+    "padding: 15px; border-radius: 10px; margin: 10px 0; border-left: 4px solid #007bff;"
+)
 
-        sentiment_icons = {
-            'positive': '😊',
-            'negative': '😞',
-            'neutral': '😐'
-        }
 
-        bg_color = sentiment_colors.get(review['pred_label'], '#f8f9fa')
-        icon = sentiment_icons.get(review['pred_label'], '🤔')
+def _terms_pattern(terms):
+    """하이라이트할 검색어들의 대소문자 무시 정규식 (긴 검색어 우선) - 없으면 None"""
+    terms = sorted({t for t in terms if t}, key=len, reverse=True)
+    if not terms:
+        return None
+    return re.compile("(" + "|".join(re.escape(t) for t in terms) + ")", re.IGNORECASE)
 
-        # 키워드 하이라이트
-        highlighted_content = review['content'].replace(
-            keyword,
-            f"**<mark style='background-color: yellow'>{keyword}</mark>**"
+
+def _highlight(text, pattern):
+    """검색어 구간만 <mark> 로 감싸고 나머지는 html 이스케이프 (줄바꿈은 <br>)"""
+    parts = pattern.split(text) if pattern is not None else [text]
+    body = "".join(
+        html.escape(part) if i % 2 == 0
+        else f"<mark style='background-color: yellow'><b>{html.escape(part)}</b></mark>"
+        for i, part in enumerate(parts)
+    )
+    # 빈 줄이 있으면 markdown 이 HTML 블록을 끊으므로 줄바꿈을 태그로 바꾼다
+    return body.replace("\n", "<br>")
+
+
+def kwic_snippets(contents, pattern, width=150):
+    """첫 번째 검색어 위치를 중심으로 앞뒤 width 글자만 잘라낸 문맥(KWIC) 스니펫 (width=None 이면 전문)"""
+    snippets = []
+    for text in contents:
+        text = "" if text is None or text != text else str(text)
+        if width is None:
+            snippets.append(text)
+            continue
+        match = pattern.search(text) if pattern is not None else None
+        center = match.start() if match else 0
+        start = max(center - width // 2, 0) if match else 0
+        end = min(start + width, len(text))
+        snippets.append(
+            ("…" if start > 0 else "") + text[start:end] + ("…" if end < len(text) else "")
+        )
+    return snippets
+
+
+def build_review_cards_html(reviews_df, terms=(), snippet_width=300, show_meta=True):
+    """
+    리뷰 목록 전체를 카드 HTML 문자열 하나로 만든다 (행마다 st.markdown 을 호출하지 않음).
+    본문은 검색어 주변 스니펫만 잘라 html 이스케이프하고, 여러 검색어를 한 번의 정규식 분할로 하이라이트한다.
+    """
+    pattern = _terms_pattern(terms)
+    snippets = kwic_snippets(reviews_df['content'].tolist(), pattern, snippet_width)
+    bodies = [_highlight(text, pattern) for text in snippets]
+
+    labels = reviews_df['pred_label'].astype(str).tolist()
+    dates = pd.to_datetime(reviews_df['created_at']).dt.strftime('%Y-%m-%d').fillna('').tolist()
+    stars = reviews_df['star'].tolist()
+    platforms = reviews_df['platform'].astype(str).tolist() if 'platform' in reviews_df else [''] * len(bodies)
+    categories = reviews_df['category'].astype(str).tolist() if 'category' in reviews_df else [''] * len(bodies)
+
+    cards = []
+    for label, star, platform, category, date, body in zip(labels, stars, platforms, categories, dates, bodies):
+        meta = f"<strong>{SENTIMENT_ICONS.get(label, '🤔')} {html.escape(label.title())}</strong>" \
+               f"<span style='margin-left: 15px;'>⭐ {star}/5</span>"
+        if show_meta:
+            if platform:
+                meta += f"<span style='margin-left: 15px;'>📱 {html.escape(platform)}</span>"
+            if category:
+                meta += f"<span style='margin-left: 15px;'>🏷️ {html.escape(category)}</span>"
+        cards.append(
+            f"<div style='background-color: {SENTIMENT_COLORS.get(label, '#f8f9fa')}; {CARD_STYLE}'>"
+            f"<div style='display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;'>"
+            f"<div>{meta}</div><small style='color: #666;'>{date}</small></div>"
+            f"<div style='line-height: 1.6;'>{body}</div></div>"
         )
+    return "".join(cards)
+
+
+def review_pager(total, key, page_sizes=(10, 20, 50)):
+    """페이지 크기·번호 선택 위젯 - (시작 위치, 페이지 크기)"""
+    col1, col2, col3 = st.columns([1, 1, 2])
+    page_size = col1.selectbox("페이지당 리뷰 수", page_sizes, key=f"{key}_page_size")
+    n_pages = max((total - 1) // page_size + 1, 1)
+    page = col2.number_input("페이지", min_value=1, max_value=n_pages, value=1, step=1, key=f"{key}_page")
+    start = (int(page) - 1) * page_size
+    col3.caption(f"전체 {total:,}개 중 {min(start + 1, total):,}–{min(start + page_size, total):,}번째 ({n_pages:,}쪽)")
+    return start, page_size
+
+
+def render_review_cards(reviews_df, terms=(), snippet_width=300, show_meta=True):
+    """리뷰 카드들을 HTML 한 덩어리로 렌더링"""
+    if isinstance(terms, str):
+        terms = [terms]
+    st.markdown(
+        build_review_cards_html(reviews_df, terms, snippet_width, show_meta),
+        unsafe_allow_html=True
+    )
 
-        # 리뷰 카드 생성
-        with st.container():
-            st.markdown(f"""
-            <div style="
-                background-color: {bg_color}; 
-                padding: 15px; 
-                border-radius: 10px; 
-                margin: 10px 0;
-                border-left: 4px solid #007bff;
-            ">
-                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 10px;">
-                    <div>
-                        <strong>{icon} {review['pred_label'].title()}</strong>
-                        <span style="margin-left: 15px;">⭐ {review['star']}/5</span>
-                        <span style="margin-left: 15px;">📱 {review['platform']}</span>
-                        <span style="margin-left: 15px;">🏷️ {review['category']}</span>
-                    </div>
-                    <small style="color: #666;">{review['created_at']}</small>
-                </div>
-                <div style="line-height: 1.6;">
-                    {highlighted_content[:300]}{'...' if len(review['content']) > 300 else ''}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-
-
-def create_keyword_comparison_section(keyword_df, df):
-    """여러 키워드 비교 기능"""
-    st.subheader("🔄 키워드 비교 분석")
 
-    top_keywords = keyword_df.head(20)['keyword'].tolist()
+def render_review_list(reviews_df, terms=(), key="reviews", snippet_width=300, show_meta=True):
+    """전체 결과에서 현재 페이지만 잘라 카드로 렌더링 (결과 크기와 무관하게 한 페이지 분량만 전송)"""
+    start, page_size = review_pager(len(reviews_df), key)
+    render_review_cards(reviews_df.iloc[start:start + page_size], terms, snippet_width, show_meta)
+
+
+def create_keyword_comparison_section(keyword_df, keyword_matrix, recent_since='2024-01-01'):
+    """여러 키워드 비교 + 동시 출현 분석 (리뷰 × 키워드 행렬 기반)"""
+    from chart_generator import create_cooccurrence_heatmap
 
-    # 다중 키워드 선택
+    st.subheader("🔄 키워드 비교 분석")
+
+    # 다중 키워드 선택 - 개수 제한 없음 (본문을 다시 스캔하지 않는다)
     selected_keywords = st.multiselect(
-        "비교할 키워드들을 선택하세요 (최대 5개)",
-        options=top_keywords,
-        max_selections=5,
+        "비교할 키워드들을 선택하세요",
+        options=keyword_df['keyword'].tolist(),
+        default=keyword_df['keyword'].head(10).tolist(),
         key="keyword_comparison"
     )
 
     if len(selected_keywords) >= 2:
-        comparison_data = []
-
-        for keyword in selected_keywords:
-            keyword_reviews = df[df['content'].str.contains(keyword, na=False)]
-
-            comparison_data.append({
-                'keyword': keyword,
-                'review_count': len(keyword_reviews),
-                'positive_rate': (keyword_reviews['pred_label'] == 'positive').mean() * 100,
-                'avg_rating': keyword_reviews['star'].mean(),
-                'recent_reviews': len(keyword_reviews[keyword_reviews['created_at'] >= '2024-01-01'])
-            })
-
-        comparison_df = pd.DataFrame(comparison_data)
+        comparison_df = keyword_matrix.keyword_stats(selected_keywords, recent_since=recent_since)
 
         # 비교 테이블
         st.markdown("#### 📊 키워드 비교표")
@@ -222,8 +291,44 @@ def create_keyword_comparison_section(keyword_df, df):
 
         st.plotly_chart(fig, use_container_width=True)
 
+        # 동시 출현 히트맵
+        st.markdown("#### 🧩 키워드 동시 출현")
+        metric = st.radio(
+            "지표",
+            ['review_count', 'lift', 'positive_rate'],
+            format_func={
+                'review_count': '동시 출현 수',
+                'lift': 'lift',
+                'positive_rate': '함께 등장 시 긍정률'
+            }.get,
+            horizontal=True,
+            key="cooccurrence_metric"
+        )
+        if metric == 'review_count':
+            matrix_df = keyword_matrix.cooccurrence(selected_keywords)
+        elif metric == 'lift':
+            matrix_df = keyword_matrix.lift(selected_keywords)
+        else:
+            matrix_df = keyword_matrix.conditional_positive_rate(selected_keywords)
+        st.plotly_chart(create_cooccurrence_heatmap(matrix_df, metric), use_container_width=True)
+
+        # 함께 자주 등장하는 키워드 쌍 (예: 배송 + 파손)
+        pairs = keyword_matrix.pairs(selected_keywords, min_count=1)
+        st.dataframe(
+            pairs.head(20).rename(columns={
+                'keyword_a': '키워드 A',
+                'keyword_b': '키워드 B',
+                'review_count': '동시 출현 수',
+                'lift': 'lift',
+                'pmi': 'PMI',
+                'positive_rate': '긍정률'
+            }).round(2),
+            use_container_width=True,
+            hide_index=True
+        )
+
 
-def add_search_functionality(df):
+def add_search_functionality(df, search_index=None):
     """텍스트 검색 기능 추가"""
     st.subheader("🔍 리뷰 텍스트 검색")
 
@@ -234,7 +339,7 @@ def add_search_functionality(df):
     )
 
     if search_term:
-        search_results = df[df['content'].str.contains(search_term, na=False, case=False)]
+        search_results = search_reviews(df, search_term, index=search_index, rank=True)
 
         if len(search_results) > 0:
             st.success(f"'{search_term}' 검색 결과: {len(search_results):,}개")
@@ -255,9 +360,9 @@ def add_search_functionality(df):
                 top_platform = platform_dist.index[0]
                 st.metric("주요 플랫폼", f"{top_platform}")
 
-            # 검색 결과 리뷰 표시 (상위 10개)
+            # 검색 결과 리뷰 표시 (출현 횟수 순, 페이지 단위)
             st.markdown("#### 검색 결과 리뷰")
-            render_review_cards(search_results.head(10), search_term)
+            render_review_list(search_results, [search_term], key="search_results", snippet_width=200)
 
         else:
             st.warning(f"'{search_term}' 검색 결과가 없습니다.")
\ No newline at end of file